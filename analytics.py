@@ -0,0 +1,260 @@
+# analytics.py
+# Every aggregation behind the dashboard, without Streamlit. dashboard.py only
+# renders what this returns, and the same calls work from batch jobs, notebooks
+# or another server:
+#
+#   import analytics, data_store, memo
+#   version = data_store.sync_store("netflix_titles.csv")
+#   engine = analytics.engine_for(version)
+#   filters = memo.Filters.make((2010, 2020), ["Movie"])
+#   top, avg = engine.top_n('country', filters)
+#
+# Results are small frames/series/arrays, memoized per (store version, filters)
+# in memo's shared cache. They are shared objects: don't modify them in place.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import cube
+import data_store
+import genre_pca
+import memo
+import multivalue
+import profiling
+from cooccurrence import CooccurrenceIndex
+
+# Independent aggregations (and figure builds) run concurrently on one shared
+# thread pool. Threads rather than processes: the engine's structures and the
+# memo cache are shared in-process, and the heavy parts (SQLite queries, numpy /
+# scipy kernels) release the GIL.
+MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Most recent engine per database, the starting point for the next version's
+_latest = {}
+_latest_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="analytics")
+        return _executor
+
+
+def run_parallel(calls):
+    # Run zero-argument callables concurrently, results in the same order. Each
+    # call must not itself wait on run_parallel (the pool is bounded). Calls run
+    # under the caller's profiler, so their stages show up in its panel.
+    futures = [executor().submit(profiling.bind(call)) for call in calls]
+    return [f.result() for f in futures]
+
+
+def engine_for(version, db_path=data_store.DB_PATH):
+    # The engine for a store version. After an incremental ingest the new
+    # engine's genre index is the previous engine's, patched with the changed
+    # titles, rather than a rebuild from the bridge table.
+    with _latest_lock:
+        previous = _latest.get(db_path)
+        if previous is not None and previous.version == version:
+            return previous
+        engine = Analytics(version, db_path)
+        if previous is not None and previous._index is not None:
+            engine._previous = previous
+        _latest[db_path] = engine
+        return engine
+
+
+class Analytics:
+    # Aggregations over one version of the store. Instances for the same
+    # (version, db_path) are interchangeable and share cached results.
+    def __init__(self, version, db_path=data_store.DB_PATH):
+        self.version = version
+        self.db_path = db_path
+        # one lock per lazily built structure, so e.g. the cube-backed charts
+        # don't wait for the genre index to load
+        self._cube_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._cube = None
+        self._index = None
+        self._previous = None  # engine of the version before, see engine_for()
+
+    @property
+    def memo_key(self):
+        # What memo.memoize keys on instead of the instance, so cached results
+        # don't keep old engines (and their cube / genre index) alive
+        return ('Analytics', self.version, self.db_path)
+
+    def __eq__(self, other):
+        return isinstance(other, Analytics) and self.memo_key == other.memo_key
+
+    def __hash__(self):
+        return hash(self.memo_key)
+
+    def __repr__(self):
+        return f"Analytics({self.version[:12]!r}, {self.db_path!r})"
+
+    # ------------------------
+    # SHARED STRUCTURES
+    # ------------------------
+    @property
+    def cube(self):
+        # Pre-aggregated count cube built at ingest (a few thousand rows)
+        with self._cube_lock:
+            if self._cube is None:
+                with profiling.stage("load_cube"):
+                    self._cube = data_store.read_cube(self.db_path)
+            return self._cube
+
+    @property
+    def index(self):
+        # Shared title x genre matrix (genre counts, co-occurrence, PCA) +
+        # co-occurrence cache + network layout
+        with self._index_lock:
+            if self._index is None:
+                with profiling.stage("cooccurrence_index"):
+                    self._index = self._carried_index() or CooccurrenceIndex.from_store(self.db_path, self.version)
+                self._previous = None
+            return self._index
+
+    def _carried_index(self):
+        # The previous version's index with the last incremental ingest applied,
+        # if that ingest went from exactly that version to this one
+        previous = self._previous
+        if previous is None or previous._index is None:
+            return None
+        changes = data_store.read_changes(self.db_path)
+        if changes is None or (changes['from'], changes['to']) != (previous.version, self.version):
+            return None
+        return previous._index.apply_changes(changes, data_store.read_layout(self.db_path))
+
+    @memo.memoize
+    def catalog_info(self):
+        # Slider bounds and the full list of ratings (for fixed colors)
+        return data_store.catalog_info(self.db_path)
+
+    # ------------------------
+    # OVERVIEW
+    # ------------------------
+    @profiling.timed
+    @memo.memoize
+    def type_counts(self, filters):
+        # Titles per type, most common first
+        return cube.value_counts(self.cube['titles'], filters.years, filters.types, 'type')
+
+    @profiling.timed
+    @memo.memoize
+    def rating_counts(self, filters):
+        return cube.value_counts(self.cube['titles'], filters.years, filters.types, 'rating')
+
+    # ------------------------
+    # TIME TRENDS
+    # ------------------------
+    @profiling.timed
+    @memo.memoize
+    def yearly_type_counts(self, filters):
+        # release_year, type, count
+        return cube.counts(self.cube['titles'], filters.years, filters.types,
+                           ['release_year', 'type']).reset_index(name='count')
+
+    @profiling.timed
+    @memo.memoize
+    def monthly_added(self, filters):
+        # month ("YYYY-MM"), count; titles without a date_added have no month and are skipped
+        added = cube.counts(self.cube['titles'], filters.years, filters.types, 'added_month')
+        return added.rename_axis('month').reset_index(name='count')
+
+    @profiling.timed
+    @memo.memoize
+    def yearly_rating_counts(self, filters):
+        # release_year, rating, count
+        return cube.counts(self.cube['titles'], filters.years, filters.types,
+                           ['release_year', 'rating']).reset_index(name='count')
+
+    # ------------------------
+    # TOP COUNTRIES / DIRECTORS / GENRES
+    # ------------------------
+    @profiling.timed
+    @memo.memoize
+    def top_n(self, dim, filters, n=10):
+        # (n most common values with their counts, average count over all values)
+        if dim == 'genre':
+            top, stats = multivalue.top_counts(self._genre_counts(filters), self.index.genres, n)
+        else:
+            top, stats = cube.top_values(self.cube[dim], filters.years, filters.types, n)
+        return top, stats['mean']
+
+    def _genre_counts(self, filters):
+        index = self.index
+        return index.matrix.genre_counts(index.select(filters.years, filters.types))
+
+    # ------------------------
+    # DURATIONS
+    # ------------------------
+    @profiling.timed
+    @memo.memoize
+    def director_durations(self, kind, filters, n=15):
+        # (top n directors by average duration, average over all director credits);
+        # minutes for "Movie", seasons for "TV Show"
+        return data_store.director_durations(kind, filters.years, filters.types, n, self.db_path)
+
+    # ------------------------
+    # GENRES
+    # ------------------------
+    @profiling.timed
+    @memo.memoize
+    def genre_pca(self, filters, solver="pca"):
+        # PCA1, PCA2, type, count: the filtered titles' genre vectors projected to
+        # 2D, titles sharing coordinates collapsed into one weighted point
+        index = self.index
+        mask = index.select(filters.years, filters.types)
+        coords = genre_pca.project(index.X[mask], solver)
+        points = pd.DataFrame({'PCA1': coords[:, 0], 'PCA2': coords[:, 1], 'type': index.types[mask]})
+        return genre_pca.collapse_points(points)
+
+    @profiling.timed
+    @memo.memoize
+    def genre_cooccurrence(self, filters):
+        # genre1, genre2, weight for every pair of genres listed together at least once
+        edges = self.index.edges(filters.years, filters.types)
+        return pd.DataFrame(edges, columns=['genre1', 'genre2', 'weight'])
+
+    def genre_positions(self, genres):
+        # Network node positions computed at ingest (stable across filters)
+        return self.index.layout(genres)
+
+    def genre_order(self):
+        # Every genre, in the network layout's node order (the order the original
+        # dashboard's graph met them over the full catalog)
+        return list(self.index.positions)
+
+    # ------------------------
+    # ALL AT ONCE
+    # ------------------------
+    def aggregations(self, filters, solver="pca"):
+        # name -> zero-argument call, for every aggregation that only needs the filters
+        return {
+            'types': lambda: self.type_counts(filters),
+            'ratings': lambda: self.rating_counts(filters),
+            'yearly_types': lambda: self.yearly_type_counts(filters),
+            'monthly_added': lambda: self.monthly_added(filters),
+            'yearly_ratings': lambda: self.yearly_rating_counts(filters),
+            'top_country': lambda: self.top_n('country', filters),
+            'top_director': lambda: self.top_n('director', filters),
+            'top_genre': lambda: self.top_n('genre', filters),
+            'durations_movie': lambda: self.director_durations('Movie', filters),
+            'durations_tv': lambda: self.director_durations('TV Show', filters),
+            'pca': lambda: self.genre_pca(filters, solver),
+            'cooccurrence': lambda: self.genre_cooccurrence(filters),
+        }
+
+    def compute(self, filters, names=None, solver="pca"):
+        # {name: result} for the given aggregations (all by default), computed
+        # concurrently: a cold filter state costs about the slowest one, not the sum
+        calls = self.aggregations(filters, solver)
+        names = list(names or calls)
+        return dict(zip(names, run_parallel([calls[name] for name in names])))
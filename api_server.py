@@ -0,0 +1,224 @@
+# api_server.py
+# Read-only HTTP JSON API over the same store and analytics engine the dashboard
+# uses, for embedding the aggregates elsewhere without a Streamlit session per
+# consumer. Runs on tornado (already installed with Streamlit).
+#
+#   python api_server.py --port 8502 --source netflix_titles.csv
+#   curl 'localhost:8502/api/top/country?year_min=2010&year_max=2020&type=Movie&n=5'
+#
+# Filters are query parameters: year_min, year_max and type (repeatable; both
+# types by default). Responses are computed once per (store version, filters,
+# endpoint), kept in memo's cache as encoded JSON, and carry an ETag, so a
+# client that already has the current body gets a 304.
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+
+import tornado.ioloop
+import tornado.web
+
+import analytics
+import data_store
+import genre_pca
+import memo
+
+SOURCE = "https://netflix-dashboard-data.s3.eu-north-1.amazonaws.com/netflix_titles.csv"
+PORT = 8502
+# How often the source is checked for changes (same as the dashboard)
+SYNC_SECONDS = 300
+CONTENT_TYPES = ("Movie", "TV Show")
+DIMENSIONS = ("country", "director", "genre")
+
+logger = logging.getLogger("netflix.api")
+
+
+def _records(frame):
+    # DataFrame/Series -> list of dicts, numpy scalars and NaN made JSON-safe
+    if hasattr(frame, 'to_frame'):
+        frame = frame.rename_axis(frame.index.name or 'name').reset_index()
+    return json.loads(frame.to_json(orient='records'))
+
+
+def _number(value):
+    return None if value is None or value != value else float(value)  # NaN -> null
+
+
+# ------------------------
+# ENDPOINTS
+# ------------------------
+# name -> function(engine, filters, params) returning a JSON-serializable object.
+# params are the endpoint's own (non-filter) query parameters, already validated.
+def _top(engine, filters, params):
+    top, avg = engine.top_n(params['dim'], filters, params['n'])
+    return {'top': _records(top), 'average': _number(avg)}
+
+
+def _durations(engine, filters, params):
+    top, overall = engine.director_durations(params['kind'], filters, params['n'])
+    return {'top': _records(top), 'average': _number(overall)}
+
+
+def _cooccurrence(engine, filters, params):
+    edges = engine.genre_cooccurrence(filters)
+    genres = sorted(set(edges['genre1']) | set(edges['genre2']))
+    positions = engine.genre_positions(genres)
+    return {
+        'edges': _records(edges),
+        'nodes': [{'genre': g, 'x': float(positions[g][0]), 'y': float(positions[g][1])} for g in genres],
+    }
+
+
+ENDPOINTS = {
+    'types': lambda engine, filters, params: _records(engine.type_counts(filters)),
+    'ratings': lambda engine, filters, params: _records(engine.rating_counts(filters)),
+    'trends/types': lambda engine, filters, params: _records(engine.yearly_type_counts(filters)),
+    'trends/added': lambda engine, filters, params: _records(engine.monthly_added(filters)),
+    'trends/ratings': lambda engine, filters, params: _records(engine.yearly_rating_counts(filters)),
+    'top': _top,
+    'durations': _durations,
+    'pca': lambda engine, filters, params: _records(engine.genre_pca(filters, params['solver'])),
+    'cooccurrence': _cooccurrence,
+}
+
+
+@memo.memoize
+def encoded_response(engine, endpoint, filters, params):
+    # -> (body bytes, etag); params is a sorted tuple of (name, value) pairs
+    body = json.dumps({
+        'version': engine.version,
+        'filters': {'year_min': filters.year_min, 'year_max': filters.year_max, 'types': list(filters.types)},
+        'data': ENDPOINTS[endpoint](engine, filters, dict(params)),
+    }, separators=(',', ':')).encode('utf-8')
+    return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+# ------------------------
+# HANDLERS
+# ------------------------
+class Store:
+    # The current store version and its engine; refreshed in the background
+    def __init__(self, source):
+        self.source = source
+        self.engine = None
+
+    def sync(self):
+        version = data_store.sync_store(self.source)
+        if self.engine is None or self.engine.version != version:
+            logger.info("serving store version %s", version[:12])
+            self.engine = analytics.engine_for(version)
+        return self.engine
+
+
+class ApiHandler(tornado.web.RequestHandler):
+    def initialize(self, store, endpoint):
+        self.store = store
+        self.endpoint = endpoint
+
+    def _int(self, name, default, minimum=None):
+        value = self.get_query_argument(name, None)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be an integer")
+        if minimum is not None and value < minimum:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be at least {minimum}")
+        return value
+
+    def _choice(self, name, value, choices):
+        if value not in choices:
+            raise tornado.web.HTTPError(404 if name in ('dim', 'kind') else 400,
+                                        reason=f"{name} must be one of {', '.join(choices)}")
+        return value
+
+    def _filters(self, engine):
+        info = engine.catalog_info()
+        types = self.get_query_arguments('type') or list(CONTENT_TYPES)
+        for t in types:
+            self._choice('type', t, CONTENT_TYPES)
+        years = (self._int('year_min', info['year_min']), self._int('year_max', info['year_max']))
+        return memo.Filters.make(years, types)
+
+    def _params(self, path_arg):
+        if self.endpoint == 'top':
+            return {'dim': self._choice('dim', path_arg, DIMENSIONS), 'n': self._int('n', 10, minimum=1)}
+        if self.endpoint == 'durations':
+            kind = {'movie': 'Movie', 'tv': 'TV Show'}.get(path_arg)
+            return {'kind': self._choice('kind', kind, ('Movie', 'TV Show')), 'n': self._int('n', 15, minimum=1)}
+        if self.endpoint == 'pca':
+            return {'solver': self._choice('solver', self.get_query_argument('solver', 'pca'), genre_pca.SOLVERS)}
+        return {}
+
+    async def get(self, path_arg=None):
+        engine = self.store.engine
+        filters = self._filters(engine)
+        params = tuple(sorted(self._params(path_arg).items()))
+        # computed in a worker thread so slow (uncached) requests don't block the others
+        loop = asyncio.get_running_loop()
+        body, etag = await loop.run_in_executor(None, encoded_response, engine, self.endpoint, filters, params)
+
+        self.set_header('Content-Type', 'application/json')
+        self.set_header('Cache-Control', f'public, max-age={SYNC_SECONDS}')
+        self.set_header('Etag', etag)
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        self.write(body)
+
+
+class IndexHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({
+            'endpoints': ['/api/' + name for name in ENDPOINTS
+                          if name not in ('top', 'durations')]
+                         + [f'/api/top/{dim}' for dim in DIMENSIONS]
+                         + ['/api/durations/movie', '/api/durations/tv'],
+            'filters': ['year_min', 'year_max', 'type (repeatable)'],
+            'cache': memo.CACHE.stats(),
+        })
+
+
+def make_app(store):
+    routes = [(r'/api/?', IndexHandler)]
+    for name in ENDPOINTS:
+        if name == 'top':
+            pattern = r'/api/top/([a-z]+)'
+        elif name == 'durations':
+            pattern = r'/api/durations/([a-z]+)'
+        else:
+            pattern = rf'/api/{name}'
+        routes.append((pattern, ApiHandler, {'store': store, 'endpoint': name}))
+    return tornado.web.Application(routes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP JSON API for the Netflix dashboard aggregates")
+    parser.add_argument("--source", default=SOURCE, help="CSV path or URL (same as the dashboard's)")
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    store = Store(args.source)
+    store.sync()
+    make_app(store).listen(args.port)
+    logger.info("listening on http://localhost:%d/api", args.port)
+
+    # Re-check the source off the event loop; requests keep using the current
+    # engine until a rebuilt store is ready
+    loop = tornado.ioloop.IOLoop.current()
+
+    async def refresh():
+        try:
+            await loop.run_in_executor(None, store.sync)
+        except Exception:
+            logger.exception("store sync failed, still serving the previous version")
+
+    tornado.ioloop.PeriodicCallback(refresh, SYNC_SECONDS * 1000).start()
+    loop.start()
+
+
+if __name__ == "__main__":
+    main()
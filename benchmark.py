@@ -0,0 +1,227 @@
+# benchmark.py
+# Benchmarks the dashboard's data pipeline outside Streamlit, on netflix_titles.csv
+# replicated to larger catalogs. Every stage the app runs (ingest, cube loading,
+# top-10 counts, director durations, co-occurrence, PCA, network figure,
+# export) is timed with its peak traced memory, and compared against a
+# stored baseline.
+#
+#   python benchmark.py                      # 1x, 10x, 100x, compare to bench_baseline.json
+#   python benchmark.py --scales 1 10 1000   # pick the catalog sizes
+#   python benchmark.py --save-baseline      # store this run as the new baseline
+#
+# Memory is measured with tracemalloc, which also slows Python allocations down:
+# compare times against a baseline taken the same way, not against the live app.
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import charts
+import cube
+import data_store
+import export
+import genre_pca
+import multivalue
+import profiling
+from cooccurrence import CooccurrenceIndex
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "netflix_titles.csv")
+BASELINE = "bench_baseline.json"
+OUTPUT = "bench_output.txt"
+SCALES = [1, 10, 100]
+
+# A stage counts as a regression when it is this much slower than the baseline
+REGRESSION_RATIO = 1.25
+# ...and slower by at least this much (tiny stages are mostly noise)
+MIN_REGRESSION_MS = 5.0
+
+
+# ------------------------
+# SYNTHETIC CATALOG
+# ------------------------
+def _vocab(values):
+    # distinct comma-separated values and how often each occurs
+    counts = values.dropna().str.split(',').explode().str.strip()
+    counts = counts[counts != ''].value_counts()
+    return counts.index.to_numpy(), (counts / counts.sum()).to_numpy()
+
+
+def _random_lists(rng, vocab, n, max_values):
+    # n comma-joined lists of 1..max_values values, drawn with the catalog's frequencies
+    names, p = vocab
+    sizes = rng.integers(1, max_values + 1, size=n)
+    picks = rng.choice(len(names), size=sizes.sum(), p=p)
+    out, start = [], 0
+    for size in sizes:
+        out.append(", ".join(dict.fromkeys(names[picks[start:start + size]])))
+        start += size
+    return out
+
+
+def synthetic_catalog(df, scale, seed=0):
+    # scale x the real catalog: copy k of every title gets a new show_id and,
+    # for k > 0, random genres and countries so the genre/country spaces stay
+    # realistic instead of being exact repeats
+    if scale == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    genres, countries = _vocab(df['listed_in']), _vocab(df['country'])
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        copy['show_id'] = copy['show_id'] + f"-{k}"
+        if k > 0:
+            copy['listed_in'] = _random_lists(rng, genres, len(copy), 3)
+            copy['country'] = _random_lists(rng, countries, len(copy), 2)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+# ------------------------
+# STAGES
+# ------------------------
+def run_pipeline(csv_path, db_path, years, types):
+    # The work behind one cold dashboard load, stage by stage (names match the
+    # stages the app's profiling panel shows where they overlap)
+    stage = profiling.stage
+
+    with stage("ingest"):
+        version = data_store.sync_store(csv_path, db_path)
+    with stage("load_cube"):
+        cubes = data_store.read_cube(db_path)
+    with stage("type/rating counts"):
+        cube.value_counts(cubes['titles'], years, types, 'type')
+        cube.value_counts(cubes['titles'], years, types, 'rating')
+    for dim in cube.VALUE_CUBE_DIMENSIONS:
+        with stage(f"top 10 {dim}"):
+            top, stats = cube.top_values(cubes[dim], years, types)
+    for kind in ("Movie", "TV Show"):
+        with stage(f"director durations ({kind})"):
+            data_store.director_durations(kind, years, types, db_path=db_path)
+    with stage("cooccurrence index"):
+        index = CooccurrenceIndex.from_store(db_path, version)
+    mask = index.select(years, types)
+    with stage("top 10 genre"):
+        top, stats = multivalue.top_counts(index.matrix.genre_counts(mask), index.genres)
+    with stage("cooccurrence counts"):
+        edges = index.edges(years, types)
+    for solver in genre_pca.SOLVERS:
+        with stage(f"pca ({solver})"):
+            coords = genre_pca.project(index.X[mask], solver)
+    with stage("pca figure"):
+        points = pd.DataFrame({'PCA1': coords[:, 0], 'PCA2': coords[:, 1], 'type': index.types[mask]})
+        charts.to_spec(charts.pca_figure(genre_pca.collapse_points(points)))
+    with stage("network figure"):
+        G = nx.Graph()
+        G.add_weighted_edges_from(edges)
+        colors = px.colors.qualitative.Plotly
+        color_map = {g: colors[i % len(colors)] for i, g in enumerate(index.positions)}
+        charts.to_spec(charts.network_figure(G, index.layout(G.nodes()), color_map))
+    with stage("export csv"):
+        export.export_bytes(years, types, "CSV", db_path=db_path)
+
+
+def _stage_paths(records):
+    # "ingest/rebuild tables" style names for nested stages
+    stack, rows = [], []
+    for r in records:
+        del stack[r['depth']:]
+        stack.append(r['stage'])
+        rows.append(('/'.join(stack), r))
+    return rows
+
+
+def benchmark(scales, source=SOURCE, years=None, types=("Movie", "TV Show")):
+    base = pd.read_csv(source)
+    years = years or (int(base['release_year'].min()), int(base['release_year'].max()))
+    # plotly loads its templates on the first figure, keep that out of the first scale
+    charts.to_spec(px.bar(x=['warm-up'], y=[1]))
+    results = {}
+    for scale in scales:
+        workdir = tempfile.mkdtemp(prefix="netflix-bench-")
+        try:
+            csv_path = os.path.join(workdir, "netflix_titles.csv")
+            synthetic_catalog(base, scale).to_csv(csv_path, index=False)
+            profiler = profiling.start(run_id=f"{scale}x")
+            try:
+                run_pipeline(csv_path, os.path.join(workdir, "netflix.db"), years, list(types))
+            finally:
+                profiling.stop(profiler)
+            results[str(scale)] = {
+                path: {'ms': round(r['ms'], 3), 'peak_mb': round(r['peak_mb'], 3)}
+                for path, r in _stage_paths(profiler.records)
+            }
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# ------------------------
+# REPORT
+# ------------------------
+def compare(results, baseline, titles):
+    # -> report lines, number of regressions
+    lines, regressions = [], 0
+    for scale, stages in results.items():
+        lines.append(f"\n== {scale}x ({titles * int(scale):,} titles) ==")
+        lines.append(f"{'stage':<44}{'ms':>11}{'peak MB':>10}{'baseline ms':>13}{'ratio':>8}")
+        for path, m in stages.items():
+            old = baseline.get(scale, {}).get(path)
+            line = f"{path:<44}{m['ms']:>11.1f}{m['peak_mb']:>10.1f}"
+            if old:
+                ratio = m['ms'] / old['ms'] if old['ms'] else float('inf')
+                flag = ratio > REGRESSION_RATIO and m['ms'] - old['ms'] > MIN_REGRESSION_MS
+                regressions += flag
+                line += f"{old['ms']:>13.1f}{ratio:>7.2f}x" + ("  SLOWER" if flag else "")
+            lines.append(line)
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Netflix dashboard pipeline")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES,
+                        help="catalog sizes as multiples of netflix_titles.csv")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--output", default=OUTPUT, help="where to write the report")
+    args = parser.parse_args(argv)
+
+    # the per-stage JSON log lines only go out when asked for
+    if not os.environ.get("NETFLIX_PROFILE_LOG"):
+        profiling.logger.disabled = True
+
+    results = benchmark(args.scales)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    titles = len(pd.read_csv(SOURCE, usecols=['show_id']))
+    lines, regressions = compare(results, baseline, titles)
+    if not baseline:
+        lines.append(f"\n(no baseline at {args.baseline}, run with --save-baseline to store one)")
+    elif regressions:
+        lines.append(f"\n{regressions} stage(s) slower than the baseline")
+
+    report = "\n".join(lines)
+    print(report)
+    with open(args.output, "w") as f:
+        f.write(report + "\n")
+
+    if args.save_baseline:
+        # keep other scales' baselines when only some scales were run
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# charts.py
+# Plotly figure builders used by dashboard.py (and timed by benchmark.py).
+import json
+from typing import NamedTuple
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
+
+# Edge width is weight / EDGE_WIDTH_SCALE (same scale the per-edge traces used)
+EDGE_WIDTH_SCALE = 40
+
+
+def _edge_traces_per_edge(G, pos):
+    # One trace per edge: exact widths, but hundreds of traces for ~40 genres
+    traces = []
+    for u, v in G.edges():
+        x0, y0 = pos[u]
+        x1, y1 = pos[v]
+        traces.append(go.Scatter(
+            x=[x0, x1],
+            y=[y0, y1],
+            line=dict(width=G[u][v]['weight']/EDGE_WIDTH_SCALE, color='gray'),
+            hoverinfo='text',
+            text=f"{u} ↔ {v} (weight: {G[u][v]['weight']})",
+            mode='lines'
+        ))
+    return traces
+
+
+def _edge_traces_batched(G, pos, weight_bands):
+    # Edges drawn as NaN-separated segments, one trace per weight band
+    # (width = band's mean weight), plus one invisible marker per edge midpoint
+    # carrying the hover text
+    edges = list(G.edges())
+    if not edges:
+        return []
+    weights = np.array([G[u][v]['weight'] for u, v in edges], dtype=float)
+    # Coordinates rounded to 4 decimals: invisible on screen, much shorter JSON
+    start = np.array([pos[u] for u, _ in edges], dtype=float).round(4)
+    end = np.array([pos[v] for _, v in edges], dtype=float).round(4)
+
+    # Log-spaced bands: co-occurrence weights are heavily skewed towards small values
+    bins = np.geomspace(weights.min(), weights.max() + 1, weight_bands + 1)
+    band = np.clip(np.searchsorted(bins, weights, side='right') - 1, 0, weight_bands - 1)
+
+    traces = []
+    for b in np.unique(band):
+        sel = band == b
+        n = sel.sum()
+        # x0, x1, NaN, x0, x1, NaN, ...
+        xs = np.column_stack([start[sel, 0], end[sel, 0], np.full(n, np.nan)]).ravel()
+        ys = np.column_stack([start[sel, 1], end[sel, 1], np.full(n, np.nan)]).ravel()
+        traces.append(go.Scatter(
+            x=xs,
+            y=ys,
+            line=dict(width=weights[sel].mean()/EDGE_WIDTH_SCALE, color='gray'),
+            hoverinfo='skip',
+            mode='lines'
+        ))
+
+    mid = (start + end) / 2
+    traces.append(go.Scatter(
+        x=mid[:, 0],
+        y=mid[:, 1],
+        mode='markers',
+        marker=dict(size=8, opacity=0),
+        hoverinfo='text',
+        text=[f"{u} ↔ {v} (weight: {int(w)})" for (u, v), w in zip(edges, weights)]
+    ))
+    return traces
+
+
+def network_figure(G, pos, color_map, batched=True, weight_bands=8):
+    # Genre co-occurrence network. batched=True ships a handful of edge traces
+    # instead of one trace per edge.
+    if batched:
+        edge_traces = _edge_traces_batched(G, pos, weight_bands)
+    else:
+        edge_traces = _edge_traces_per_edge(G, pos)
+
+    node_trace = go.Scatter(
+        x=[pos[n][0] for n in G.nodes()],
+        y=[pos[n][1] for n in G.nodes()],
+        mode='markers+text',
+        text=list(G.nodes()),
+        textposition="top center",
+        hoverinfo='text',
+        marker=dict(
+            size=30,
+            color=[color_map[n] for n in G.nodes()],
+            line=dict(width=2, color='black')
+        )
+    )
+
+    fig = go.Figure(data=edge_traces + [node_trace])
+    fig.update_layout(
+        title="Netflix Genre Co-Occurrence Network",
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=20, l=5, r=5, t=40),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+    )
+    return fig
+
+
+def pca_figure(points, max_points=5000, nbins=60):
+    # points: output of genre_pca.collapse_points. Weighted scatter (marker size = number of
+    # titles) while there are at most max_points distinct points, a 2D-binned
+    # density heatmap per type beyond that, so the payload stays bounded either way.
+    title = 'PCA Clustering of Genres'
+    if len(points) > max_points:
+        fig = px.density_heatmap(points, x='PCA1', y='PCA2', z='count', histfunc='sum',
+                                 facet_col='type', nbinsx=nbins, nbinsy=nbins, title=title,
+                                 labels={'count': 'Titles'})
+        return fig
+    fig = px.scatter(points, x='PCA1', y='PCA2', color='type', size='count',
+                     hover_data={'count': True}, size_max=40, title=title,
+                     labels={'count': 'Titles'})
+    return fig
+
+
+# ------------------------
+# SERIALIZED FIGURES
+# ------------------------
+class FigureSpec(NamedTuple):
+    # A built figure serialized once: json is the full spec as sent to the
+    # browser, layout is kept as a dict so overlays can be added without
+    # rebuilding or re-validating the figure
+    json: str
+    data_json: str
+    layout: dict
+
+
+def to_spec(fig):
+    fig_dict = fig.to_plotly_json()
+    data_json = json.dumps(fig_dict['data'], cls=PlotlyJSONEncoder)
+    layout = json.loads(json.dumps(fig_dict['layout'], cls=PlotlyJSONEncoder))
+    return FigureSpec(f'{{"data":{data_json},"layout":{json.dumps(layout)}}}', data_json, layout)
+
+
+def with_shapes(spec, shapes):
+    # spec's JSON with extra layout shapes; only the (small) layout is re-encoded
+    if not shapes:
+        return spec.json
+    layout = dict(spec.layout, shapes=list(spec.layout.get('shapes', [])) + list(shapes))
+    # (PlotlyJSONEncoder writes NaN, e.g. the average of an empty selection, as null)
+    return f'{{"data":{spec.data_json},"layout":{json.dumps(layout, cls=PlotlyJSONEncoder)}}}'
+
+
+def hline_shape(y, dash="dash", color="white", width=3):
+    # Same shape fig.add_hline() adds: full plot width at y
+    return {'type': 'line', 'xref': 'x domain', 'x0': 0, 'x1': 1, 'yref': 'y', 'y0': y, 'y1': y,
+            'line': {'dash': dash, 'color': color, 'width': width}}
+
+
+def vline_shape(x, dash="dash", color="white", width=3):
+    # Same shape fig.add_vline() adds: full plot height at x
+    return {'type': 'line', 'xref': 'x', 'x0': x, 'x1': x, 'yref': 'y domain', 'y0': 0, 'y1': 1,
+            'line': {'dash': dash, 'color': color, 'width': width}}
@@ -0,0 +1,109 @@
+# cooccurrence.py
+# Genre co-occurrence counts for the network tab. The genre x genre matrix is one
+# sparse product (X^T X over the title x genre matrix), cached per filter state
+# and carried over (patched, not recomputed) to the next store version after an
+# incremental ingest. The index also carries the network layout computed at
+# ingest, so node positions are stable across filters.
+import threading
+
+import scipy.sparse as sp
+
+import data_store
+import memo
+import network_layout
+from genre_matrix import filter_mask
+
+# Filter states kept per index (oldest dropped first)
+MAX_CACHED_FILTERS = 64
+
+
+def filter_key(years, types):
+    # Normalized sidebar state (same key as the shared memo cache uses)
+    return memo.Filters.make(years, types)
+
+
+def cooccurrence_matrix(X):
+    # X: titles x genres 0/1 matrix -> genres x genres counts of titles listing
+    # both genres. Only the upper triangle is kept (the diagonal is titles per genre).
+    C = (X.T @ X).tocsr()
+    return sp.triu(C, k=1, format='csr')
+
+
+class CooccurrenceIndex:
+    # Co-occurrence cache over the shared title x genre matrix (genre_matrix.py)
+    def __init__(self, matrix, positions=None):
+        self.matrix = matrix
+        # genre -> (x, y) in the layout's node order; genres missing from the
+        # stored layout get a spot outside it and come last
+        self.positions = network_layout.place_new_nodes(positions or {}, matrix.genres)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, db_path=data_store.DB_PATH, version=None):
+        # The matrix saved at ingest for `version` (rebuilt from title_genre if missing)
+        return cls(data_store.read_genre_matrix(version, db_path), data_store.read_layout(db_path))
+
+    # the matrix's arrays, for callers that slice rows themselves (PCA)
+    @property
+    def X(self):
+        return self.matrix.X
+
+    @property
+    def genres(self):
+        return self.matrix.genres
+
+    @property
+    def years(self):
+        return self.matrix.years
+
+    @property
+    def types(self):
+        return self.matrix.types
+
+    @property
+    def title_ids(self):
+        return self.matrix.title_ids
+
+    def select(self, years, types):
+        # Row mask of the titles passing the sidebar filters
+        return self.matrix.select(years, types)
+
+    def counts(self, years, types):
+        key = filter_key(years, types)
+        with self._lock:
+            C = self._cache.get(key)
+            if C is None:
+                C = cooccurrence_matrix(self.X[filter_mask(key, self.years, self.types)])
+                if len(self._cache) >= MAX_CACHED_FILTERS:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = C
+        return C
+
+    def edges(self, years, types):
+        # [(genre, genre, weight), ...] for every pair that co-occurs at least once
+        C = self.counts(years, types).tocoo()
+        return [(self.genres[i], self.genres[j], int(w)) for i, j, w in zip(C.row, C.col, C.data)]
+
+    def layout(self, genres):
+        # Stored positions of the given genres (nothing is recomputed per filter)
+        return {g: self.positions[g] for g in genres}
+
+    def apply_changes(self, changes, positions):
+        # Index for the store version after an incremental ingest, from
+        # data_store.read_changes(); this one is left as it is (older sessions may
+        # still use it). Rows of removed/changed titles are dropped, the changed and
+        # new ones added, and every cached per-filter matrix is patched with the
+        # difference instead of being recomputed.
+        with self._lock:
+            # old genre columns -> their place in the new genre order
+            P = self.matrix.genre_map(changes['names'])
+            matrix, gone, added = self.matrix.apply_changes(changes)
+            index = CooccurrenceIndex(matrix, positions)
+            for key, C in self._cache.items():
+                C = sp.triu(P.T @ (C + C.T) @ P, k=1, format='csr')
+                C = (C - cooccurrence_matrix(gone.X[filter_mask(key, gone.years, gone.types)])
+                     + cooccurrence_matrix(added.X[filter_mask(key, added.years, added.types)])).tocsr()
+                C.eliminate_zeros()
+                index._cache[key] = C
+        return index
@@ -0,0 +1,50 @@
+# cube.py
+# Pre-aggregated title counts built at ingest. Every count chart is a sum over a
+# slice of these small tables instead of a scan over the titles, so filter
+# latency stays flat as the catalog grows.
+import pandas as pd
+
+import multivalue
+
+# Main cube: titles per release_year x type x rating x month added ("YYYY-MM")
+CUBE_COLUMNS = ['release_year', 'type', 'rating', 'added_month']
+
+# Per-value cubes: titles per release_year x type x value, for these bridge dimensions
+# (genre counts are column sums of the shared genre matrix, see genre_matrix.py)
+VALUE_CUBE_DIMENSIONS = ['country', 'director']
+
+
+def build_cube(df):
+    keys = df[['release_year', 'type', 'rating']].assign(
+        added_month=df['date_added'].dt.strftime('%Y-%m')  # NaT -> missing
+    )
+    return keys.groupby(CUBE_COLUMNS, dropna=False, observed=True).size().reset_index(name='n')
+
+
+def build_value_cube(df, bridge, dim):
+    # bridge: (title_id, <dim>_id) pairs from the normalized side table
+    keys = bridge.merge(df[['title_id', 'release_year', 'type']], on='title_id')
+    return keys.groupby(['release_year', 'type', f'{dim}_id'], observed=True).size().reset_index(name='n')
+
+
+def select(cube, years, types):
+    return cube[cube['release_year'].between(years[0], years[1]) & cube['type'].isin(types)]
+
+
+def counts(cube, years, types, by):
+    # Titles per `by` (a column or list of columns) within the filter slice
+    return select(cube, years, types).groupby(by, observed=True)['n'].sum()
+
+
+def value_counts(cube, years, types, by='name'):
+    # Like Series.value_counts(): most common first (ties by name)
+    out = counts(cube, years, types, by).rename('count').reset_index()
+    out = out.sort_values(['count', by], ascending=[False, True])
+    return pd.Series(out['count'].values, index=out[by].astype(object).values, name='count')
+
+
+def top_values(cube, years, types, n=10):
+    # Value cubes only: (n most common names, stats with the mean over all
+    # occurring names), in one bincount over the name codes
+    sl = select(cube, years, types)
+    return multivalue.top_n(sl['name'].cat.codes.values, sl['name'].cat.categories.values, n, sl['n'].values)
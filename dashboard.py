@@ -0,0 +1,621 @@
+# dashboard.py
+# The Streamlit page shared by app.py and app_local_version.py, which only say
+# where the CSV comes from and call render(). All aggregations live in
+# analytics.py; this module builds the figures and lays out the page.
+import json
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import networkx as nx
+
+import analytics
+import charts
+import data_store
+import export
+import genre_pca
+import memo
+import profiling
+
+
+netflix_charts_info = {
+    "1": {
+        "what_i_did": "I took all Netflix titles and counted how many are Movies versus TV Shows.",
+        "what_the_chart_shows": "Each slice of the pie represents the proportion of Movies and TV Shows in the dataset.",
+        "what_i_found": "Movies make up about 70% of Netflix’s catalog, while TV shows only account for 30%.",
+        "interpretation": "Netflix has historically been movie-heavy, with more than twice as many films as series. This suggests that while TV shows may dominate pop culture conversations, the platform’s foundation is still primarily built on movies.",
+        "features": "Hover to see exact counts and percentages; click legend to hide/show categories."
+    },
+    "2": {
+        "what_i_did": "I grouped Netflix titles by their content rating (like PG, R, TV-MA, etc.) and counted how many titles fall into each category.",
+        "what_the_chart_shows": "Each slice represents one rating category, showing how common different ratings are across all titles.",
+        "what_i_found": "The most common ratings are TV-MA (36%) and TV-14 (25%), followed by TV-PG (10%), R (9%), and PG-13 (5%). Everything else is under 5%.",
+        "interpretation": "Despite Netflix’s reputation for mature, edgy content, the majority of titles actually fall in the “teen/family” safe zone (TV-14 and below make up ~40%). At the same time, over one-third of the catalog is TV-MA, reflecting a balance: Netflix caters both to family viewing and adult audiences, but skews a bit more toward the latter.",
+        "features": "Hover to see counts and percentages; click legend to toggle ratings on/off."
+    },
+    "3": {
+        "what_i_did": "I grouped titles by release year and type (Movie or TV Show), then counted how many of each type came out each year.",
+        "what_the_chart_shows": "Each bar represents a year. The bar is split into stacked segments for Movies and TV Shows, showing their yearly distribution.",
+        "what_i_found": "Netflix’s catalog grew very slowly from the 1950s to the early 2000s. Around 2005, movies ramped up significantly, and by 2015 growth exploded, peaking in 2018–2019 with over 1,500 titles. After that, total additions declined, especially for movies. TV shows, which started much later, also peaked around 2018 but declined more gently.",
+        "interpretation": "Netflix hit a “boom” phase around 2015–2019, adding titles aggressively to build its library. The sharp decline afterward may reflect a pivot: instead of maximizing quantity, Netflix began curating more carefully, possibly due to licensing issues and competition. The relative stability of TV shows compared to movies suggests a shift in focus toward serial content during this period.",
+        "features": "Hover to see exact counts; toggle Movies or TV Shows from the legend to focus on one category."
+    },
+    "4": {
+        "what_i_did": "I used the `date_added` field to count how many titles Netflix added over time, grouped by month.",
+        "what_the_chart_shows": "The line represents how many titles were added to Netflix each month, showing peaks and trends in content acquisition.",
+        "what_i_found": "Content additions were steady until 2015, after which Netflix sharply increased yearly releases. Growth plateaued around 2017–2018, then declined.",
+        "interpretation": "This trend reflects Netflix’s transition from “building a catalog” to “maintaining one.” After an initial period of rapid expansion, Netflix may have shifted resources toward original productions and quality control, explaining the leveling-off.",
+        "features": "Hover to see exact counts per month; zoom and pan across the timeline."
+    },
+    "5": {
+        "what_i_did": "I grouped titles by release year and rating, then counted how many titles had each rating in each year.",
+        "what_the_chart_shows": "Each line corresponds to a content rating (e.g., TV-MA, PG-13). It shows how that rating’s popularity changed over time.",
+        "what_i_found": "All ratings categories grew sharply around 2015, but peaked around 2018 and then declined. TV-14 rose early, but TV-MA eventually became dominant, peaking at over 500 titles. Other categories (PG, R, etc.) never reached the same scale.",
+        "interpretation": "Netflix’s early growth leaned family-friendly (TV-14), but the long-term shift is toward adult-oriented TV-MA content. This aligns with Netflix’s reputation for edgy original programming and may reflect higher retention from mature series compared to family titles.",
+        "features": "Hover to see yearly counts per rating; click legend to show/hide ratings and compare trends."
+    },
+    "6": {
+        "what_i_did": "I counted how many titles were produced in each country and selected the top 10 most frequent.",
+        "what_the_chart_shows": "Each bar represents one country, with bar length showing how many Netflix titles came from that country.",
+        "what_i_found": "The U.S. dominates Netflix’s catalog with over 3,600 titles. The U.K. follows with ~750, Canada (~450), France (~400), Japan (~300), and India (~100). The average country contributes ~80 titles.",
+        "interpretation": "Netflix is overwhelmingly U.S.-centric, but its expansion strategy clearly emphasizes English-speaking countries first, with selective investments in other markets. Japan and India show Netflix’s global ambitions, though they remain far behind the U.S. and Europe in volume.",
+        "features": "Hover to see counts; bars are sorted for easy comparison."
+    },
+    "7": {
+        "what_i_did": "I counted how many titles each director was credited for and selected the top 10.",
+        "what_the_chart_shows": "Each bar represents a director, with bar length showing the number of titles they directed.",
+        "what_i_found": "Most directors on Netflix only have about one title. But a few dominate: Rajiv Chilaka (22 titles), Jan Suter (21), Raul Campos (18), Marcus Raboy & Suhas Kadav (16), Cathy Garcia Molina (13).",
+        "interpretation": "Netflix content is highly fragmented across thousands of directors, but a few prolific names (many tied to specific regional industries like India or Mexico) contribute disproportionately. This shows Netflix’s strategy of partnering with certain “high-output” creators in emerging markets.",
+        "features": "Hover to see counts; sorted by number of titles for clarity."
+    },
+    "8": {
+        "what_i_did": "I split titles into genres and counted how many times each genre appeared, then picked the 10 most common.",
+        "what_the_chart_shows": "Each bar represents one genre, with bar length showing how many titles belong to that genre.",
+        "what_i_found": "International Movies lead (2,700+), followed by Dramas (2,400+), Comedies (1,600+), and International TV Shows (1,300+). Other genres like Documentaries, Action & Adventure, Independent Movies, Children & Family, and Romantic Movies range from ~600–850 each.",
+        "interpretation": "Netflix’s library heavily favors international content and drama — likely because these genres travel well across cultures. Comedy and action are also major pillars, but niche categories (like romance or children’s movies) remain secondary.",
+        "features": "Hover to see counts; color-coded bars make genres easy to distinguish."
+    },
+    "9": {
+        "what_i_did": "For Movies only, I converted their duration into minutes and calculated each director’s average runtime. I then selected the top 15.",
+        "what_the_chart_shows": "Each bar represents a director, with bar length showing their average movie runtime.",
+        "what_i_found": "The average Netflix movie runs ~100 minutes. But some directors massively exceed that: Will Eisenberg (253 min avg), Scott McAboy, Joe Menendez, Pawan Kirpalani (~230 min), and the rest of the top 15 all average above 180 min.",
+        "interpretation": "While most Netflix films are standard feature length, some directors specialize in unusually long projects — possibly reflecting specific genres (epics, multi-part films, or extended documentary features). This points to experimentation at the fringes of the catalog.",
+        "features": "Hover to see exact average durations; sorted from longest to shortest for comparison."
+    },
+    "10": {
+        "what_i_did": "For TV Shows only, I converted the “duration” field into number of seasons and calculated each director’s average. I then selected the top 15.",
+        "what_the_chart_shows": "Each bar represents a director, with bar length showing their average number of seasons per show.",
+        "what_i_found": "The average Netflix TV show lasts only 1.6 seasons. But outliers like Jérémy Clapin (15 seasons) and a handful of others (Upi Avianto, Andrew Niccol, Kongkiat Komesir) last 7–9 seasons.",
+        "interpretation": "Most Netflix shows are very short-lived, with few reaching multi-season longevity. This supports the view that Netflix frequently experiments with series but cancels quickly if traction isn’t achieved. A small handful of long-running series stand out as exceptions.",
+        "features": "Hover to see averages; sorted list makes comparison easier."
+    },
+    "11": {
+        "what_i_did": "I took all of Netflix’s titles and represented them by their genres (e.g., comedy, drama, horror, etc.). That makes each title a big list of 0/1 values (“is this title in this genre?”). Since that data is very high-dimensional, I used a technique called PCA (Principal Component Analysis) to compress it down into just 2 dimensions, while keeping as much of the structure as possible.",
+        "what_the_chart_shows": "Each dot is a Netflix title. Dots that are close together share similar genre profiles. I then colored the dots by whether the title is a Movie or a TV Show.",
+        "what_i_found": "TV Shows tend to cluster together tightly. This suggests Netflix TV shows often follow a fairly narrow set of genre combinations (for example, a lot of shows may fall into predictable mixes like drama + comedy or action + thriller). Movies are much more scattered. This means Netflix movies cover a broader and more diverse range of genres — you can find everything from rom-coms to horror to documentaries.",
+        "interpretation": "TV shows on Netflix are less experimental in genre (maybe to ensure long-term engagement), while movies are more varied and unpredictable.",
+        "features": "Hover over dots to see title and details; zoom and pan around clusters."
+    },
+    "12": {
+        "what_i_did": "I built a network where each node is a genre. If two genres appear together in the same title, they are connected by an edge. Edge thickness reflects how often the genres co-occur. Node size reflects how many titles belong to that genre.",
+        "what_the_chart_shows": "The network shows how genres overlap. Larger nodes mean more titles in that genre, and thicker edges mean those two genres often appear together.",
+        "what_i_found": "Genres like International Movies and Dramas dominate the network with the most connections to other genres. Comedy is also highly interconnected. By contrast, niches like British TV, Docuseries, or Stand-Up Comedy have very few connections.",
+        "interpretation": "Netflix’s catalog revolves around broad, versatile genres (International, Drama, Comedy) that combine easily with others. Niche genres remain siloed with fewer overlaps, suggesting either a smaller catalog base or untapped opportunities. This could reflect where Netflix sees mainstream vs. niche audience value.",
+        "features": "Hover over nodes to see genre names; hover over edges to see co-occurrence counts; zoom and pan; legend allows selection of genres (if dropdown is enabled)."
+    }
+}
+
+
+# ------------------------
+# DATA
+# ------------------------
+# Builds/refreshes netflix.db only when the source CSV changed (checked every 5 min).
+# The rebuild runs in the background: the previous version is served until it
+# is done, and a first build is served batch by batch as it comes in.
+@profiling.timed
+@st.cache_data(ttl=300, show_spinner=False)
+def source_version(source):
+    return data_store.sync_store(source, background=True)
+
+# Distinct PCA points shown as a scatter before switching to a density heatmap
+PCA_MAX_POINTS = 5000
+
+# Reruns are served from these cached results, no database writes.
+# All aggregations live in analytics.py; this module only renders them. No
+# session holds the title rows themselves: the engine reads the count cube, the
+# bridge tables and the genre index, and the export streams from SQLite.
+# Everything that depends on the filters goes through memo's LRU cache, which
+# is keyed on the normalized filter state and shared by every session, so a
+# popular filter combination is computed once. Its values are shared objects:
+# never modify them in place.
+@st.cache_resource(max_entries=4)
+def analytics_engine(version):
+    return analytics.engine_for(version)
+
+# Export payloads are only built when asked for, and kept per filter state + format
+@profiling.timed
+@st.cache_data(max_entries=16, show_spinner="Preparing export...")
+def export_data(version, years, content_type, fmt):
+    return export.export_bytes(years, content_type, fmt)
+
+
+# the extra info under every chart
+def show_chart_info(key):
+    with st.expander("❓", expanded=False):
+        plot_info = netflix_charts_info[key]
+        st.markdown(f"""
+        **What I did:** {plot_info['what_i_did']}  
+        **What the chart shows:** {plot_info['what_the_chart_shows']}  
+        **What I found:** {plot_info['what_i_found']}  
+        **Interpretation:** {plot_info['interpretation']}  
+        **Features:** {plot_info['features']}
+        """)
+
+
+
+# ------------------------
+# FIGURES
+# ------------------------
+# Built figures are cached like the aggregates, serialized to JSON once per
+# (chart, filter state) as charts.FigureSpec. Toggles like "Show Average Line"
+# aren't part of the key: the line is added to the cached spec when rendering.
+@profiling.timed
+@memo.memoize
+def type_pie(engine, filters):
+    type_counts = engine.type_counts(filters)
+    fig = px.pie(values=type_counts.values, names=type_counts.index, title="Movies vs TV Shows")
+    return charts.to_spec(fig)
+
+@profiling.timed
+@memo.memoize
+def rating_pie(engine, filters):
+    rating_counts = engine.rating_counts(filters)
+    fig = px.pie(values=rating_counts.values, names=rating_counts.index, title="Distribution of Ratings")
+    return charts.to_spec(fig)
+
+@profiling.timed
+@memo.memoize
+def type_year_figure(engine, filters):
+    fig = px.bar(engine.yearly_type_counts(filters), x='release_year', y='count', color='type',
+                 title='Movies vs TV Shows per Year', barmode='stack',
+                 labels={'release_year':'Year', 'count':'Number of Titles'})
+    return charts.to_spec(fig)
+
+@profiling.timed
+@memo.memoize
+def added_figure(engine, filters):
+    fig = px.line(
+        engine.monthly_added(filters),
+        x='month',
+        y='count',
+        labels={'month':'Month','count':'Number of Titles added that month'},
+        title='Number of Content Added Each Month'
+    )
+    return charts.to_spec(fig)
+
+@profiling.timed
+@memo.memoize
+def rating_year_figure(engine, filters):
+    # Define a fixed color map for ratings
+    unique_ratings = engine.catalog_info()['ratings']
+    colors = px.colors.qualitative.Plotly  # or any palette you like
+    color_map = {rating: colors[i % len(colors)] for i, rating in enumerate(sorted(unique_ratings))}
+
+    # Create the line chart with fixed colors
+    fig = px.line(
+        engine.yearly_rating_counts(filters),
+        x='release_year',
+        y='count',
+        color='rating',
+        title='Content Ratings Over Time',
+        color_discrete_map=color_map
+    )
+    return charts.to_spec(fig)
+
+# dim -> (axis label, title)
+TOP_CHARTS = {
+    'country': ('Country', "Top 10 Countries Producing Netflix Titles + Average"),
+    'director': ('Director', "Top 10 Directors + Average"),
+    'genre': ('Genre', "Top 10 Genres + Average"),
+}
+
+@profiling.timed
+@memo.memoize
+def top_figure(engine, filters, dim):
+    # -> (spec, average) for the average line overlay
+    top, avg = engine.top_n(dim, filters)  # avg: across all countries/directors/genres
+    top_with_avg = pd.concat([top, pd.Series({'Average': avg})])
+
+    if dim == 'country':
+        # Colors: original Pastel for top 10, gray for Average
+        colors = [px.colors.qualitative.Pastel[i] for i in range(len(top))] + ['gray']
+    elif dim == 'director':
+        # Colors: original Vivid for top 10, gray for Average
+        colors = [px.colors.qualitative.Vivid[i] for i in range(len(top))] + ['gray']
+    else:
+        # Use D3 colors for top 10, magenta for Independent Movies
+        colors = px.colors.qualitative.D3[:len(top)]
+        colors = [("magenta" if genre == "Independent Movies" else color)
+                  for genre, color in zip(top.index, colors)]
+        colors.append("gray")  # Average bar
+
+    label, title = TOP_CHARTS[dim]
+    fig = px.bar(
+        x=top_with_avg.index,
+        y=top_with_avg.values,
+        labels={'x': label, 'y': 'Number of Titles'},
+        title=title,
+        color=top_with_avg.index,
+        color_discrete_sequence=colors
+    )
+    return charts.to_spec(fig), avg
+
+# kind -> (axis label, title)
+DURATION_CHARTS = {
+    'Movie': ('Average Movie Duration (min)', "Top 15 Movie Directors + Overall Average"),
+    'TV Show': ('Average TV Show Duration (seasons)', "Top 15 TV Show Directors + Overall Average"),
+}
+
+@profiling.timed
+@memo.memoize
+def duration_figure(engine, filters, kind):
+    # -> (spec, overall average) for the average line overlay
+    # Directors come from the title_director table, one row per director credit
+    avg_duration, overall_avg_duration = engine.director_durations(kind, filters)
+    avg_duration = avg_duration.rename_axis('director').reset_index()
+
+    avg_duration_with_avg = pd.concat([
+        avg_duration.set_index('director')['duration_num'],
+        pd.Series({'Average': overall_avg_duration})
+    ]).reset_index()
+    avg_duration_with_avg.columns = ['director','duration_num']
+
+    # All bars same color except Average bar
+    bar_color = "steelblue"
+    colors = [bar_color]*len(avg_duration) + ["gray"]
+
+    label, title = DURATION_CHARTS[kind]
+    fig = px.bar(
+        avg_duration_with_avg,
+        x='duration_num',
+        y='director',
+        orientation='h',
+        labels={'duration_num':label,'director':'Director'},
+        title=title,
+        color=avg_duration_with_avg['director'],
+        color_discrete_sequence=colors
+    )
+    fig.update_layout(yaxis={'categoryorder':'total ascending'})
+    return charts.to_spec(fig), overall_avg_duration
+
+@profiling.timed
+@memo.memoize
+def pca_figure(engine, filters, solver):
+    # Weighted points (size = number of titles), density heatmap past PCA_MAX_POINTS
+    fig = charts.pca_figure(engine.genre_pca(filters, solver), max_points=PCA_MAX_POINTS)
+    return charts.to_spec(fig)
+
+@profiling.timed
+@memo.memoize
+def network_figure(engine, filters):
+    # Create NetworkX graph from the filtered co-occurrence counts
+    edges = engine.genre_cooccurrence(filters)
+    G = nx.Graph()
+    G.add_weighted_edges_from(edges.itertuples(index=False, name=None))
+
+    # Node positions come from the layout computed once at ingest over all
+    # genres (see network_layout.py), so they don't move when filters change
+    pos = engine.genre_positions(G.nodes())
+
+    # Node colors, assigned over all genres in layout order so a genre keeps
+    # its color whichever genres the filters leave in the graph
+    colors = px.colors.qualitative.Plotly  # color palette
+    genre_color_map = {genre: colors[i % len(colors)] for i, genre in enumerate(engine.genre_order())}
+
+    # Edges are batched into a few NaN-separated traces (one per weight band)
+    # plus an invisible midpoint trace for the hover text
+    return charts.to_spec(charts.network_figure(G, pos, genre_color_map, batched=True))
+
+
+# Sending a serialized figure as is relies on Streamlit internals (the
+# PlotlyChart proto and st._main._enqueue) that are only known to work with
+# the version pinned in requirements.txt; any other version takes the public
+# st.plotly_chart path
+RAW_PLOTLY_STREAMLIT = "1.30.0"
+if st.__version__ == RAW_PLOTLY_STREAMLIT:
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+else:
+    PlotlyChartProto = None
+
+
+@profiling.timed(name="render")
+def plotly_spec_chart(spec, shapes=()):
+    # st.plotly_chart() with an already serialized figure. st.plotly_chart would
+    # rebuild, validate and re-serialize the figure on every rerun; this sends the
+    # cached JSON (plus any overlay shapes) as is.
+    spec = charts.with_shapes(spec, shapes)
+    if PlotlyChartProto is None:
+        return st.plotly_chart(pio.from_json(spec), use_container_width=True)
+    proto = PlotlyChartProto()
+    proto.use_container_width = True
+    proto.figure.spec = spec
+    proto.figure.config = json.dumps({"showLink": False, "linkText": False})
+    proto.theme = "streamlit"
+    return st._main._enqueue("plotly_chart", proto)
+
+
+# ------------------------
+# TAB 1: Overview
+# ------------------------
+# Each tab builds its figures concurrently (see analytics.run_parallel), then
+# renders them in order
+def overview_tab(engine, filters):
+    type_fig, rating_fig = analytics.run_parallel([
+        lambda: type_pie(engine, filters),
+        lambda: rating_pie(engine, filters),
+    ])
+
+#Movies and TV show pie chart
+    st.subheader("Movies vs TV Shows")
+    plotly_spec_chart(type_fig)
+    show_chart_info("1")  # 1 = the first plot
+
+#Distribution of age ratings Pie Chart
+    st.subheader("Distribution of Ratings")
+    plotly_spec_chart(rating_fig)
+    show_chart_info("2")
+
+# ------------------------
+# TAB 2: Time Analysis
+# ------------------------
+def time_tab(engine, filters):
+    type_year_fig, added_fig, rating_fig = analytics.run_parallel([
+        lambda: type_year_figure(engine, filters),
+        lambda: added_figure(engine, filters),
+        lambda: rating_year_figure(engine, filters),
+    ])
+
+#MOVIES vs TV SHOWS Over Time
+    st.subheader("Movies vs TV Shows Over Time")
+    plotly_spec_chart(type_year_fig)
+    show_chart_info("3")
+
+# Content Added Per Month (Fixed)
+    st.subheader("Content Added Over Time (Monthly)")
+    plotly_spec_chart(added_fig)
+    show_chart_info("4")
+
+# Content Ratings Trends Over Years
+    st.subheader("Content Ratings Trends Over Years")
+    plotly_spec_chart(rating_fig)
+    show_chart_info("5")
+
+# ------------------------
+# TAB 3: Top Countries / Directors / Genres
+# ------------------------
+def top_tab(engine, filters):
+    country_fig, director_fig, genre_fig = analytics.run_parallel(
+        [lambda dim=dim: top_figure(engine, filters, dim) for dim in TOP_CHARTS]
+    )
+
+# Top 10 Countries
+    st.subheader("Top 10 Countries Producing Netflix Titles")
+    # Checkbox to show/hide average line
+    show_avg_line_countries = st.checkbox("Show Average Line (Countries)", value=True)
+    spec, avg = country_fig
+    plotly_spec_chart(spec, [charts.hline_shape(avg)] if show_avg_line_countries else [])
+    show_chart_info("6")
+
+# Top 10 Directors
+    st.subheader("Top 10 Directors")
+    show_avg_line_directors = st.checkbox("Show Average Line (Directors)", value=True)
+    spec, avg = director_fig
+    plotly_spec_chart(spec, [charts.hline_shape(avg)] if show_avg_line_directors else [])
+    show_chart_info("7")
+
+# Top 10 Genres
+    st.subheader("Top 10 Genres")
+    show_avg_line = st.checkbox("Show Average Line", value=True)
+    spec, avg = genre_fig
+    plotly_spec_chart(spec, [charts.hline_shape(avg)] if show_avg_line else [])
+    show_chart_info("8")
+
+# ------------------------
+# TAB 4: Duration Analysis
+# ------------------------
+def duration_tab(engine, filters):
+    movie_fig, tv_fig = analytics.run_parallel(
+        [lambda kind=kind: duration_figure(engine, filters, kind) for kind in DURATION_CHARTS]
+    )
+
+    # Top 15 Movie Directors
+    st.subheader("Top 15 Movie Directors by Average Movie Duration")
+    # Checkbox to show/hide average line
+    show_avg_line_movies = st.checkbox("Show Average Line (Movies)", value=True)
+    spec, avg = movie_fig
+    plotly_spec_chart(spec, [charts.vline_shape(avg)] if show_avg_line_movies else [])
+    show_chart_info("9")
+
+    # Top 15 TV Show Directors
+    st.subheader("Top 15 TV Show Directors by Average Number of Seasons")
+    show_avg_line_tv = st.checkbox("Show Average Line (TV Shows)", value=True)
+    spec, avg = tv_fig
+    plotly_spec_chart(spec, [charts.vline_shape(avg)] if show_avg_line_tv else [])
+    show_chart_info("10")
+
+# ------------------------
+# TAB 5: PCA Genre Clustering
+# ------------------------
+def pca_tab(engine, filters):
+    #PCA CLuster genre graph thingy
+    st.subheader("PCA Clustering of Genres")
+    # exact PCA / IncrementalPCA over sparse batches / sparse SVD (never densified)
+    pca_solver = st.radio("PCA solver", genre_pca.SOLVERS, horizontal=True)
+    plotly_spec_chart(pca_figure(engine, filters, pca_solver))
+    st.markdown("""
+    **Explanation:** Each dot represents the titles sharing one genre combination (bigger dot = more titles). Dots close together share similar genre combinations.
+    TV Shows cluster tightly (predictable genres), Movies are more spread out (diverse genres).
+    """)
+    show_chart_info("11")
+
+# ------------------------
+# TAB 6: Genre Co-Occurrence Network
+# ------------------------
+def network_tab(engine, filters):
+
+    #CO occurence network
+    st.subheader("Genre Co-occurence network")
+    plotly_spec_chart(network_figure(engine, filters))
+    show_chart_info("12")
+
+# ------------------------
+# TABS FOR PLOTS
+# ------------------------
+# st.tabs would run every tab on every rerun (it only hides them), so the
+# active tab is picked with a radio and only that tab's function runs
+TABS = {
+    "Overview": overview_tab,
+    "Time Analysis": time_tab,
+    "Top Countries/Directors/Genres": top_tab,
+    "Duration Analysis": duration_tab,
+    "PCA Genre Clustering": pca_tab,
+    "Genre Co-Occurrence": network_tab,
+}
+
+
+# ------------------------
+# PAGE
+# ------------------------
+def render(source):
+    # One run of the page, top to bottom, for the CSV at `source` (path or URL)
+    st.set_page_config(page_title="Netflix Dashboard", layout="wide")
+
+    # Opt-in profiling (NETFLIX_PROFILE=1 or ?profile=1): every stage and chart of
+    # this run is timed and shown in a sidebar panel, and logged as JSON lines
+    profiling.stop(st.session_state.pop('profiler', None))  # previous run may have been cut short
+    if profiling.enabled_by_env() or st.query_params.get("profile") == "1":
+        st.session_state['profiler'] = profiling.start()
+    st.title("📊 Netflix Interactive Data Analysis Dashboard")
+    st.markdown("Interactive dashboard to explore Netflix content with filters, charts, PCA clustering, and genre networks.")
+
+    # ------------------------
+    # LOAD DATA
+    # ------------------------
+    source_version(source)
+    # One small metadata read per rerun, so a finished rebuild (or the next batch of
+    # a first build) shows up without waiting for the 5 min check
+    store = data_store.store_state()
+    version = store['version']
+    engine = analytics_engine(version)
+    info = engine.catalog_info()
+    if not store['complete']:
+        st.info(f"Still loading the catalog: showing the first {store['rows']:,} titles. Interact with the page to refresh.")
+
+    # ------------------------
+    # CUSTOM CSS (make sidebar skinnier)
+    # ------------------------
+    st.markdown(
+        """
+        <style>
+            /* Make sidebar narrower */
+            [data-testid="stSidebar"][aria-expanded="true"] {
+                width: 200px;
+            }
+            [data-testid="stSidebar"][aria-expanded="false"] {
+                width: 200px;
+                margin-left: -200px;
+            }
+            /* Shrink font size inside sidebar to fit better */
+            [data-testid="stSidebar"] * {
+                font-size: 0.9rem;
+            }
+        </style>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # ------------------------
+    # SIDEBAR HEADER (Big red n at top)
+    # ------------------------
+    st.sidebar.markdown(
+        "<div style='text-align:center; margin-top:-20px;'>"
+        "<span style='color:#E50914; font-size:100px; font-weight:bold;'>n</span>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+
+    st.sidebar.markdown("<h3 style='text-align:center;'>Filters</h3>", unsafe_allow_html=True)
+
+    # ------------------------
+    # SIDEBAR FILTERS
+    # ------------------------
+    year_min = info['year_min']
+    year_max = info['year_max']
+    years = st.sidebar.slider("Release Year Range", year_min, year_max, (year_min, year_max))
+
+    content_type = st.sidebar.multiselect("Content Type", ["Movie", "TV Show"], default=["Movie","TV Show"])
+    content_type = tuple(content_type)  # hashable, part of every cache key
+    filters = memo.Filters.make(years, content_type)
+
+    # ------------------------
+    # DOWNLOAD DATA BUTTON
+    # ------------------------
+    st.sidebar.markdown("---")
+    # The file is only generated after "Prepare download" is clicked (not on every
+    # rerun), for the filters that were active at that moment
+    export_format = st.sidebar.selectbox("Export format", list(export.EXPORT_FORMATS))
+    export_key = (years, content_type, export_format)
+    if st.sidebar.button("Prepare download"):
+        st.session_state['export_key'] = export_key
+    if st.session_state.get('export_key') == export_key:
+        extension, mime = export.EXPORT_FORMATS[export_format]
+        st.sidebar.download_button(
+            label=f"📥 Download Filtered Data ({export_format})",
+            data=export_data(version, years, content_type, export_format),
+            file_name=f"netflix_filtered.{extension}",
+            mime=mime
+        )
+
+    # ------------------------
+    # SOCIAL LINKS (GitHub & LinkedIn, gray + centered)
+    # ------------------------
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(
+        """
+        <div style="text-align:center;">
+            <a href="https://github.com/WardKousa/Interactive-Data-Visualization-of-Netflix" target="_blank">
+                <img src="https://cdn.jsdelivr.net/gh/devicons/devicon/icons/github/github-original.svg" 
+                width="30" style="filter: grayscale(100%); margin-right:10px;"/>
+            </a>
+            <a href="https://www.linkedin.com/in/ward-kousa-9a4101346/" target="_blank">
+                <img src="https://cdn.jsdelivr.net/gh/devicons/devicon/icons/linkedin/linkedin-original.svg" 
+                width="30" style="filter: grayscale(100%);"/>
+            </a>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # filled in once the active tab has rendered
+    cache_stats = st.sidebar.empty()
+
+    # ------------------------
+    # ACTIVE TAB (see TABS)
+    # ------------------------
+    active_tab = st.radio("Tab", list(TABS), horizontal=True, label_visibility="collapsed")
+    with profiling.stage(f"tab: {active_tab}"):
+        TABS[active_tab](engine, filters)
+
+    stats = memo.CACHE.stats()
+    cache_stats.caption(
+        f"Cache: {stats['hits']} hits / {stats['misses']} misses, "
+        f"{stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB)"
+    )
+
+    # Profiling panel: what this run spent where (cache hits show up as ~0 ms)
+    profiler = profiling.stop()
+    if profiler is not None:
+        with st.sidebar.expander("⏱️ Profiling", expanded=True):
+            st.caption(f"Run: {profiler.total_ms():.0f} ms")
+            st.dataframe(pd.DataFrame(profiler.summary()), hide_index=True, use_container_width=True)
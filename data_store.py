@@ -0,0 +1,873 @@
+# data_store.py
+# Persistent ingest layer shared by app.py and app_local_version.py.
+# The titles table is built once from the source CSV and only rebuilt when the
+# source actually changes, so Streamlit reruns never write to the database.
+# The CSV is streamed in batches of CHUNK_ROWS rows: memory during a rebuild is
+# one batch plus the aggregates, however large the catalog.
+import glob
+import hashlib
+import itertools
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import scipy.sparse as sp
+
+import cube
+import genre_matrix
+import multivalue
+import network_layout
+import profiling
+
+DB_PATH = "netflix.db"
+
+# Bump whenever the tables written by _Ingest change, so old stores get rebuilt
+STORE_VERSION = 12
+
+# CSV rows cleaned and written per ingest batch
+CHUNK_ROWS = 20000
+# Bytes per read while hashing/downloading the source
+READ_BLOCK = 1 << 20
+
+# Columns the sidebar filters and charts slice on
+INDEXED_COLUMNS = ['release_year', 'type', 'rating', 'date_added']
+
+ARROW_STRING = pd.StringDtype('pyarrow')
+
+# The parsed titles frame: column -> dtype, whichever way it was loaded (CSV
+# ingest or SQLite). Low-cardinality text is categorical, the remaining text
+# Arrow-backed strings instead of Python objects. Dates and durations are
+# parsed once, by parse_titles() at ingest, and stored parsed.
+TITLES_SCHEMA = {
+    'title_id': 'int32',
+    'show_id': ARROW_STRING,
+    'type': 'category',
+    'title': ARROW_STRING,
+    'director': ARROW_STRING,
+    'cast': ARROW_STRING,
+    'country': 'category',
+    'date_added': 'datetime64[ns]',
+    'release_year': 'int16',
+    'rating': 'category',
+    'duration': 'category',
+    'listed_in': 'category',
+    'description': ARROW_STRING,
+    'duration_minutes': 'float32',
+    'duration_seasons': 'float32',
+}
+CATEGORY_COLUMNS = [c for c, dtype in TITLES_SCHEMA.items() if dtype == 'category']
+STRING_COLUMNS = [c for c, dtype in TITLES_SCHEMA.items() if dtype is ARROW_STRING]
+NUMERIC_COLUMNS = {c: dtype for c, dtype in TITLES_SCHEMA.items() if dtype in ('int16', 'int32', 'float32')}
+# Columns parse_titles() adds to the CSV's
+PARSED_COLUMNS = ['duration_minutes', 'duration_seasons']
+# Duration column per content type
+DURATION_COLUMNS = {'Movie': 'duration_minutes', 'TV Show': 'duration_seasons'}
+
+# date_added as written in the CSV ("September 25, 2021", surrounding spaces stripped)
+DATE_FORMAT = '%B %d, %Y'
+# duration as written in the CSV: "90 min", "1 Season", "3 Seasons"
+DURATION_PATTERN = r'^\s*(?P<n>\d+)\s*(?P<unit>min|Seasons?)\s*$'
+
+# Comma-joined columns exploded at ingest into normalized side tables:
+# dimension -> source column. Each dimension gets a dictionary table dim_<name>
+# (id, name) and a bridge table title_<name> (title_id, <name>_id).
+MULTI_VALUE_COLUMNS = {
+    'country': 'country',
+    'director': 'director',
+    'genre': 'listed_in',
+    'cast': 'cast',
+}
+
+logger = logging.getLogger("netflix.data_store")
+
+# Background ingests (sync_store(background=True)), one per database file
+_background = {}
+_background_lock = threading.Lock()
+
+
+# ------------------------
+# PARSING
+# ------------------------
+def parse_titles(df):
+    # The one parsing stage: a raw CSV batch (all text) -> typed columns, in place.
+    #   date_added: datetime64, NaT when missing or not in DATE_FORMAT
+    #   duration_minutes / duration_seasons: the number in "90 min" / "3 Seasons",
+    #       NaN in the other column (and in both when the duration is missing)
+    #   release_year: int16; rating: missing -> "Unknown"
+    df['date_added'] = pd.to_datetime(df['date_added'].str.strip(), format=DATE_FORMAT, errors='coerce')
+
+    # One vectorized regex pass (Arrow) splits number and unit
+    parts = pc.extract_regex(pa.array(df['duration'], type=pa.string(), from_pandas=True), DURATION_PATTERN)
+    number, unit = parts.flatten()  # null where the pattern didn't match
+    number = pc.cast(number, pa.float32())
+    df['duration_minutes'] = pc.if_else(pc.equal(unit, 'min'), number, None).to_numpy(zero_copy_only=False)
+    df['duration_seasons'] = pc.if_else(pc.starts_with(unit, 'Season'), number, None).to_numpy(zero_copy_only=False)
+
+    df['release_year'] = pd.to_numeric(df['release_year']).astype(TITLES_SCHEMA['release_year'])
+    df['rating'] = df['rating'].fillna('Unknown')
+    return df
+
+
+def to_unix_seconds(dates):
+    # datetime64 -> Int64 seconds since 1970 (how SQLite stores date_added;
+    # date(date_added, 'unixepoch') reads it back in SQL)
+    return ((dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).astype('Int64')
+
+
+def from_unix_seconds(seconds):
+    # A numeric conversion, not parsing
+    return pd.to_datetime(seconds, unit='s')
+
+
+def apply_dtypes(df):
+    # Same dtypes (TITLES_SCHEMA) for frames coming from the CSV or SQLite
+    if 'date_added' in df and not pd.api.types.is_datetime64_any_dtype(df['date_added']):
+        df['date_added'] = from_unix_seconds(df['date_added'])
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('category')
+    for col in STRING_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype(ARROW_STRING)
+    for col, dtype in NUMERIC_COLUMNS.items():
+        if col in df:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+# ------------------------
+# CONNECTION / METADATA
+# ------------------------
+def connect(db_path=DB_PATH):
+    # isolation_level=None so we control transactions ourselves (BEGIN IMMEDIATE)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    # WAL lets readers keep serving while a rebuild is being written
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+def read_meta(conn):
+    return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+
+def _write_meta(conn, values):
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        [(k, str(v)) for k, v in values.items()]
+    )
+
+
+def _has_table(conn, name):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone()
+    return row is not None
+
+
+# ------------------------
+# SOURCE FINGERPRINT
+# ------------------------
+def is_url(source):
+    return str(source).startswith(("http://", "https://"))
+
+
+def source_stat(source):
+    # Cheap size/mtime check. For URLs we ask the server with a HEAD request.
+    if is_url(source):
+        req = urllib.request.Request(source, method="HEAD")
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return {
+                'source_size': resp.headers.get('Content-Length', ''),
+                'source_mtime': resp.headers.get('Last-Modified', '') + resp.headers.get('ETag', ''),
+            }
+    st = os.stat(source)
+    return {'source_size': str(st.st_size), 'source_mtime': str(st.st_mtime_ns)}
+
+
+def _fetch_source(source, workdir):
+    # -> (local path, sha256 hex digest, temp file to remove or None). The source
+    # is hashed (and, for URLs, downloaded next to the database) block by block,
+    # never held in memory as a whole
+    h = hashlib.sha256()
+    if is_url(source):
+        fd, tmp = tempfile.mkstemp(suffix='.csv', dir=workdir)
+        try:
+            with os.fdopen(fd, 'wb') as out, urllib.request.urlopen(source, timeout=60) as resp:
+                for block in iter(lambda: resp.read(READ_BLOCK), b''):
+                    h.update(block)
+                    out.write(block)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return tmp, h.hexdigest(), tmp
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b''):
+            h.update(block)
+    return source, h.hexdigest(), None
+
+
+# ------------------------
+# BUILD / SYNC
+# ------------------------
+def _create_table(conn, df, table, keys=None):
+    conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.execute(pd.io.sql.get_schema(df, table, keys=keys))
+
+
+def _append_rows(conn, df, table):
+    # Rows go in through plain executemany so a rebuild stays inside our own
+    # transactions (DataFrame.to_sql commits on its own)
+    placeholders = ", ".join("?" * len(df.columns))
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    conn.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+
+
+def _insert_frame(conn, df, table, keys=None):
+    _create_table(conn, df, table, keys)
+    _append_rows(conn, df, table)
+
+
+def explode_values(df, column):
+    # "United States, India," -> one (title_id, value) row per distinct non-empty
+    # value, values dictionary-encoded: (pairs with title_id/code, sorted names)
+    tokens = multivalue.tokenize(df[column])
+    pairs = pd.DataFrame({'title_id': df['title_id'].values[tokens.rows], 'code': tokens.codes})
+    return pairs, tokens.vocab
+
+
+def _add_counts(total, part, keys):
+    # Running total of a count table: rows with the same keys are summed, rows
+    # that drop to zero (everything they counted was removed) are dropped
+    if total is None:
+        return part
+    both = pd.concat([total, part], ignore_index=True)
+    out = both.groupby(keys, dropna=False, observed=True)['n'].sum().reset_index()
+    return out[out['n'] != 0].reset_index(drop=True)
+
+
+def _negated(counts):
+    return counts.assign(n=-counts['n'])
+
+
+def _read_batches(path):
+    # (CSV batch, content hash per row). Columns are read as text (typing is
+    # parse_titles()'s job) so a row's hash depends on the row alone
+    for chunk in pd.read_csv(path, chunksize=CHUNK_ROWS, dtype=str):
+        yield chunk, pd.util.hash_pandas_object(chunk, index=False).values.view(np.int64)
+
+
+class _Ingest:
+    # One rebuild of the tables, fed a batch of CSV rows at a time. Titles and
+    # bridge rows are appended as they come; the dictionaries, cubes and the
+    # genre co-occurrence counts are running totals, sized by the distinct values
+    # rather than by the number of titles, and rewritten by write_aggregates().
+    #
+    # Dictionary ids are given out in first-seen order so earlier batches never
+    # need renumbering; readers order values by name (see read_bridge/read_cube).
+    def __init__(self, conn, early_indexes=False):
+        self.conn = conn
+        # Indexes are cheaper to build once at the end, unless readers use the
+        # tables while batches are still coming in
+        self.early_indexes = early_indexes
+        self.rows = 0      # titles written by this ingest
+        self.next_id = 0   # next unused title_id
+        self.ids = {dim: {} for dim in MULTI_VALUE_COLUMNS}  # name -> id
+        self.cube = None
+        self.value_cubes = {dim: None for dim in cube.VALUE_CUBE_DIMENSIONS}
+        self.genre_gram = sp.csr_matrix((0, 0), dtype=np.int32)  # X^T X over title x genre
+        self.genre_order = []  # node order of the network layout, see _add_genre_order()
+        self._has_titles = False
+
+    def start(self):
+        for dim in MULTI_VALUE_COLUMNS:
+            _create_table(self.conn, pd.DataFrame({'id': pd.Series(dtype='int64'), 'name': pd.Series(dtype=object)}),
+                          f'dim_{dim}', keys='id')
+            _create_table(self.conn, pd.DataFrame({'title_id': pd.Series(dtype='int64'),
+                                                   f'{dim}_id': pd.Series(dtype='int64')}), f'title_{dim}')
+        # node: place in the layout's node order (network colors follow it)
+        _create_table(self.conn, pd.DataFrame({'genre_id': pd.Series(dtype='int64'), 'x': pd.Series(dtype='float64'),
+                                               'y': pd.Series(dtype='float64'), 'node': pd.Series(dtype='int64')}),
+                      'genre_layout', keys='genre_id')
+        # show_id and content hash of every title, for incremental ingests
+        _create_table(self.conn, pd.DataFrame({'title_id': pd.Series(dtype='int64'), 'show_id': pd.Series(dtype=object),
+                                               'row_hash': pd.Series(dtype='int64')}), 'title_hash', keys='title_id')
+        # title_ids touched by the last incremental ingest (empty after a full one)
+        _create_table(self.conn, pd.DataFrame({'title_id': pd.Series(dtype='int64'), 'removed': pd.Series(dtype='int64'),
+                                               'added': pd.Series(dtype='int64')}), 'title_changes', keys='title_id')
+
+    def add(self, chunk, hashes, title_ids=None):
+        # title_ids: the ids to write the rows under, new ones by default
+        if title_ids is None:
+            title_ids = np.arange(self.next_id, self.next_id + len(chunk))
+        if len(title_ids):
+            self.next_id = max(self.next_id, int(title_ids.max()) + 1)
+        chunk = parse_titles(chunk)
+        chunk.insert(0, 'title_id', title_ids)
+        self._write_titles(chunk)
+        _append_rows(self.conn, pd.DataFrame({'title_id': title_ids, 'show_id': chunk['show_id'].values,
+                                              'row_hash': hashes}), 'title_hash')
+
+        bridges = {}
+        for dim, column in MULTI_VALUE_COLUMNS.items():
+            pairs, names = explode_values(chunk, column)
+            bridge = pd.DataFrame({'title_id': pairs['title_id'].values,
+                                   f'{dim}_id': self._value_ids(dim, names)[pairs['code'].values]})
+            _append_rows(self.conn, bridge, f'title_{dim}')
+            bridges[dim] = bridge
+
+        self.cube = _add_counts(self.cube, cube.build_cube(chunk), cube.CUBE_COLUMNS)
+        for dim in cube.VALUE_CUBE_DIMENSIONS:
+            self.value_cubes[dim] = _add_counts(self.value_cubes[dim], cube.build_value_cube(chunk, bridges[dim], dim),
+                                                ['release_year', 'type', f'{dim}_id'])
+        if self.genre_gram is not None:
+            self._add_genre_gram(bridges['genre'], title_ids)
+            self._add_genre_order(chunk[MULTI_VALUE_COLUMNS['genre']], bridges['genre'], title_ids)
+        self.rows += len(chunk)
+
+    def _write_titles(self, chunk):
+        out = chunk.copy()
+        out['date_added'] = to_unix_seconds(out['date_added'])
+        if not self._has_titles:
+            # the first batch fixes the schema
+            _create_table(self.conn, out, 'titles', keys='title_id')
+            if self.early_indexes:
+                self._create_indexes()
+            self._has_titles = True
+        _append_rows(self.conn, out, 'titles')
+
+    def _create_indexes(self):
+        for col in INDEXED_COLUMNS:
+            self.conn.execute(f'CREATE INDEX idx_titles_{col} ON titles ({col})')
+        # Composite index matching the sidebar filter (type IN ... AND release_year BETWEEN ...)
+        self.conn.execute('CREATE INDEX idx_titles_type_year ON titles (type, release_year)')
+        for dim in MULTI_VALUE_COLUMNS:
+            self.conn.execute(f'CREATE INDEX idx_title_{dim}_title ON title_{dim} (title_id)')
+            self.conn.execute(f'CREATE INDEX idx_title_{dim}_value ON title_{dim} ({dim}_id)')
+        self.conn.execute('CREATE INDEX idx_title_hash_show ON title_hash (show_id)')
+
+    def _value_ids(self, dim, names):
+        # Batch vocabulary -> dictionary ids, new names added to dim_<dim>
+        ids = self.ids[dim]
+        new = [name for name in names if name not in ids]
+        first = len(ids)
+        ids.update((name, first + i) for i, name in enumerate(new))
+        if new:
+            _append_rows(self.conn, pd.DataFrame({'id': range(first, first + len(new)), 'name': new}), f'dim_{dim}')
+        return np.array([ids[name] for name in names], dtype=np.int64)
+
+    def _add_genre_gram(self, genre_bridge, title_ids):
+        n = len(self.ids['genre'])
+        rows = pd.Index(title_ids).get_indexer(genre_bridge['title_id'].values)
+        X = sp.csr_matrix(
+            (np.ones(len(genre_bridge), dtype=np.int32), (rows, genre_bridge['genre_id'].values)),
+            shape=(len(title_ids), n)
+        )
+        self.genre_gram.resize((n, n))
+        self.genre_gram = (self.genre_gram + X.T @ X).tocsr()
+
+    def write_aggregates(self):
+        # The cubes as they stand after the batches so far
+        _insert_frame(self.conn, self.cube, 'cube_titles')
+        for dim in cube.VALUE_CUBE_DIMENSIONS:
+            _insert_frame(self.conn, self.value_cubes[dim], f'cube_{dim}')
+
+    def finish(self):
+        if not self.early_indexes:
+            self._create_indexes()
+        self.write_aggregates()
+        self._write_layout()
+
+    def _add_genre_order(self, listed_in, genre_bridge, title_ids):
+        # Genres in the order the original dashboard's graph first met them (titles
+        # in CSV order, each title's genre pairs in listed order, each pair sorted);
+        # the circular layout and its SWAP_PAIRS are laid out in this order. Only
+        # rows listing a genre not placed yet can add to it.
+        placed = [self.ids['genre'][g] for g in self.genre_order]
+        rows = genre_bridge['title_id'].values[~np.isin(genre_bridge['genre_id'].values, placed)]
+        seen = set(self.genre_order)
+        for text in listed_in.values[pd.Index(title_ids).get_indexer(pd.unique(rows))]:
+            genres = list(dict.fromkeys(g.strip() for g in text.split(',') if g.strip()))
+            for pair in itertools.combinations(genres, 2):
+                for g in sorted(pair):
+                    if g not in seen:
+                        seen.add(g)
+                        self.genre_order.append(g)
+
+    def _write_layout(self):
+        # Network node positions over the full catalog's co-occurrence graph (see
+        # network_layout.py); the gram is put in name order like cooccurrence_matrix()
+        names = np.array(list(self.ids['genre']), dtype=object)
+        order = np.argsort(names, kind='stable')
+        gram = self.genre_gram[order][:, order]
+        C = sp.triu(gram.tocsr(), k=1, format='csr')  # same edge order as cooccurrence_matrix()
+        pos = network_layout.compute_layout(C, list(names[order]), node_order=self.genre_order)
+        ids = self.ids['genre']
+        layout = pd.DataFrame(
+            [(ids[g], float(p[0]), float(p[1]), node) for node, (g, p) in enumerate(pos.items())],
+            columns=['genre_id', 'x', 'y', 'node']
+        )
+        self.conn.execute("DELETE FROM genre_layout")
+        _append_rows(self.conn, layout, 'genre_layout')
+
+
+class _DeltaIngest(_Ingest):
+    # Applies a new version of the CSV to an existing store, keyed on show_id:
+    # rows whose content hash is unchanged are skipped, changed ones are
+    # rewritten under their title_id, new ones appended, and show_ids no longer
+    # in the CSV removed. The cubes are patched with the difference and the
+    # dictionaries only grow. The network layout is kept, genres new to the
+    # store get a spot around it when read (network_layout.place_new_nodes).
+    # Touched title_ids are recorded in title_changes (see read_changes()).
+    def __init__(self, conn):
+        super().__init__(conn)
+        self.ids = {dim: dict(conn.execute(f"SELECT name, id FROM dim_{dim}").fetchall())
+                    for dim in MULTI_VALUE_COLUMNS}
+        self.cube = pd.read_sql("SELECT * FROM cube_titles", conn)
+        self.value_cubes = {dim: pd.read_sql(f"SELECT * FROM cube_{dim}", conn)
+                            for dim in cube.VALUE_CUBE_DIMENSIONS}
+        (last,) = conn.execute("SELECT MAX(title_id) FROM title_hash").fetchone()
+        self.next_id = 0 if last is None else last + 1
+        self.genre_gram = None
+        self._has_titles = True
+        self.counts = {'unchanged': 0, 'changed': 0, 'added': 0, 'removed': 0}
+
+    def start(self):
+        for table in ('batch (pos INTEGER, show_id TEXT)', 'seen (title_id INTEGER PRIMARY KEY)',
+                      'gone (title_id INTEGER PRIMARY KEY)'):
+            self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table}")
+            self.conn.execute(f"DELETE FROM temp.{table.split()[0]}")
+        self.conn.execute("DELETE FROM title_changes")
+
+    def add(self, chunk, hashes):
+        # The batch's show_ids looked up in title_hash in one join
+        self.conn.executemany("INSERT INTO temp.batch VALUES (?, ?)",
+                              zip(range(len(chunk)), chunk['show_id'].astype(object)))
+        known = pd.read_sql("SELECT b.pos, h.title_id, h.row_hash FROM temp.batch b JOIN title_hash h USING (show_id)",
+                            self.conn)
+        self.conn.execute("DELETE FROM temp.batch")
+        title_ids = np.full(len(chunk), -1, dtype=np.int64)
+        title_ids[known['pos'].values] = known['title_id'].values
+        old_hashes = np.zeros(len(chunk), dtype=np.int64)
+        old_hashes[known['pos'].values] = known['row_hash'].values
+
+        changed = (title_ids >= 0) & (old_hashes != hashes)
+        new = title_ids < 0
+        title_ids[new] = np.arange(self.next_id, self.next_id + new.sum())
+        self.conn.executemany("INSERT OR IGNORE INTO temp.seen VALUES (?)", ((int(t),) for t in title_ids))
+
+        self.remove(title_ids[changed])
+        write = changed | new
+        if write.any():
+            super().add(chunk[write].reset_index(drop=True), hashes[write], title_ids[write])
+        self.conn.executemany("INSERT OR REPLACE INTO title_changes VALUES (?, ?, 1)",
+                              ((int(t), int(c)) for t, c in zip(title_ids[write], changed[write])))
+        self.counts['unchanged'] += int((~write).sum())
+        self.counts['changed'] += int(changed.sum())
+        self.counts['added'] += int(new.sum())
+
+    def remove(self, title_ids):
+        # Subtract the titles' stored rows from the cubes, then delete them
+        if not len(title_ids):
+            return
+        self.conn.execute("DELETE FROM temp.gone")
+        self.conn.executemany("INSERT INTO temp.gone VALUES (?)", ((int(t),) for t in title_ids))
+        where = "WHERE title_id IN (SELECT title_id FROM temp.gone)"
+        old = pd.read_sql(f"SELECT title_id, release_year, type, rating, date_added FROM titles {where}", self.conn)
+        old['date_added'] = from_unix_seconds(old['date_added'])
+        self.cube = _add_counts(self.cube, _negated(cube.build_cube(old)), cube.CUBE_COLUMNS)
+        for dim in MULTI_VALUE_COLUMNS:
+            if dim in cube.VALUE_CUBE_DIMENSIONS:
+                bridge = pd.read_sql(f"SELECT title_id, {dim}_id FROM title_{dim} {where}", self.conn)
+                self.value_cubes[dim] = _add_counts(self.value_cubes[dim],
+                                                    _negated(cube.build_value_cube(old, bridge, dim)),
+                                                    ['release_year', 'type', f'{dim}_id'])
+            self.conn.execute(f"DELETE FROM title_{dim} {where}")
+        self.conn.execute(f"DELETE FROM titles {where}")
+        self.conn.execute(f"DELETE FROM title_hash {where}")
+
+    def finish(self):
+        # show_ids missing from the new CSV
+        gone = [t for (t,) in self.conn.execute(
+            "SELECT title_id FROM title_hash WHERE title_id NOT IN (SELECT title_id FROM temp.seen)")]
+        self.remove(np.array(gone, dtype=np.int64))
+        self.conn.executemany("INSERT INTO title_changes VALUES (?, 1, 0)", ((t,) for t in gone))
+        self.counts['removed'] = len(gone)
+        self.write_aggregates()
+        logger.info("incremental ingest: %s", self.counts)
+
+
+def _is_current(conn, meta):
+    return (_has_table(conn, 'titles') and 'source_hash' in meta
+            and meta.get('store_version') == str(STORE_VERSION))
+
+
+def _same_columns(conn, path):
+    # An incremental ingest needs the CSV to have the columns the titles were stored with
+    stored = [row[1] for row in conn.execute("PRAGMA table_info(titles)")]
+    header = list(pd.read_csv(path, nrows=0).columns)
+    return stored == ['title_id'] + header + PARSED_COLUMNS
+
+
+def _ingest(conn, path, digest, stat, db_path, mode, on_commit):
+    # Stream the CSV at `path` into the tables, CHUNK_ROWS at a time. mode:
+    #   'full': rebuild in one transaction, readers keep the previous version
+    #       until it commits.
+    #   'progressive': rebuild with every batch its own commit, so readers can
+    #       start on the first batches (see store_state()). For first builds.
+    #   'delta': apply only the new/changed/removed rows to the current store,
+    #       in one transaction (see _DeltaIngest).
+    progressive = mode == 'progressive'
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another session may have rebuilt while we were reading the source
+        meta = read_meta(conn)
+        if _is_current(conn, meta) and meta['source_hash'] == digest:
+            # Same content (e.g. only touched) -> just refresh the stat values
+            _write_meta(conn, stat)
+            conn.execute("COMMIT")
+            return False
+        if mode == 'delta' and _is_current(conn, meta) and _same_columns(conn, path):
+            ingest = _DeltaIngest(conn)
+        else:
+            mode = 'progressive' if progressive else 'full'
+            ingest = _Ingest(conn, early_indexes=progressive)
+        ingest.start()
+        if progressive:
+            conn.execute("DELETE FROM meta WHERE key IN ('source_hash', 'store_version')")
+            _write_meta(conn, {'ingest_hash': digest, 'ingest_rows': 0})
+            conn.execute("COMMIT")
+
+        with profiling.stage("ingest batches"):
+            for chunk, hashes in _read_batches(path):
+                if progressive:
+                    conn.execute("BEGIN IMMEDIATE")
+                ingest.add(chunk, hashes)
+                if progressive:
+                    ingest.write_aggregates()
+                    _write_meta(conn, {'ingest_rows': ingest.rows})
+                    conn.execute("COMMIT")
+                    on_commit()
+
+        if progressive:
+            conn.execute("BEGIN IMMEDIATE")
+        with profiling.stage("finish tables"):
+            ingest.finish()
+        (rows,) = conn.execute("SELECT COUNT(*) FROM titles").fetchone()
+        conn.execute("DELETE FROM meta WHERE key IN ('ingest_hash', 'ingest_rows', 'changes_from')")
+        if mode == 'delta':
+            _write_meta(conn, {'changes_from': meta['source_hash']})
+        _write_meta(conn, dict(stat, source_hash=digest, store_version=STORE_VERSION, rows=rows))
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    with profiling.stage("genre matrix"):
+        write_genre_matrix(digest, db_path, previous=meta['source_hash'] if mode == 'delta' else None)
+    return True
+
+
+def _sync(source, db_path, incremental=True, ready=None):
+    # sync_store() proper. With `ready` (a threading.Event, background syncs)
+    # a first build commits batch by batch, and ready is set as soon as callers
+    # have something to serve: the current store, or the first committed batch.
+    # Otherwise the caller sets it once this returns or raises.
+    progressive = ready is not None
+    ready = ready or threading.Event()
+    conn = connect(db_path)
+    try:
+        meta = read_meta(conn)
+        built = _is_current(conn, meta)
+
+        try:
+            stat = source_stat(source)
+        except OSError:
+            # Source unreachable: keep serving what we already have
+            if built:
+                return meta['source_hash']
+            raise
+
+        # Fast path: nothing changed on disk (or on the server)
+        if built and all(meta.get(k) == v for k, v in stat.items()):
+            return meta['source_hash']
+        if built:
+            ready.set()  # the previous version stays up during the rebuild
+
+        with profiling.stage("read source"):
+            path, digest, tmp = _fetch_source(source, os.path.dirname(os.path.abspath(db_path)))
+        try:
+            if built:
+                mode = 'delta' if incremental else 'full'
+            else:
+                mode = 'progressive' if progressive else 'full'
+            _ingest(conn, path, digest, stat, db_path, mode, on_commit=ready.set)
+        finally:
+            if tmp:
+                os.remove(tmp)
+        return digest
+    finally:
+        conn.close()
+
+
+def sync_store(source, db_path=DB_PATH, background=False, incremental=True):
+    """Make sure the store matches the source CSV. Returns the source hash.
+
+    A changed source is applied incrementally (only new/changed/removed
+    show_ids) unless incremental=False, which rebuilds every table.
+    With background=True a rebuild runs in a background thread and this returns
+    as soon as there is something to serve: right away when a previous version
+    exists, otherwise after the first batch. Returns store_state()'s version then.
+    """
+    if not background:
+        return _sync(source, db_path, incremental)
+    key = os.path.abspath(db_path)
+    with _background_lock:
+        job = _background.get(key)
+        if job is None or not job['thread'].is_alive():
+            job = {'ready': threading.Event(), 'error': None}
+
+            def run():
+                try:
+                    _sync(source, db_path, incremental, job['ready'])
+                except Exception as e:
+                    job['error'] = e
+                    logger.exception("background ingest of %s failed", source)
+                finally:
+                    # after the error is recorded, so waiting callers see it
+                    job['ready'].set()
+
+            job['thread'] = threading.Thread(target=run, name="netflix-ingest", daemon=True)
+            _background[key] = job
+            job['thread'].start()
+    job['ready'].wait()
+    version = store_state(db_path)['version']
+    if version is None and job['error'] is not None:
+        raise job['error']
+    return version
+
+
+def store_state(db_path=DB_PATH):
+    # What readers can use right now: {'version', 'complete', 'rows'}. During a
+    # first build the batches committed so far are served under a version that
+    # changes with every batch; version is None before the first one.
+    conn = connect(db_path)
+    try:
+        meta = read_meta(conn)
+        if _is_current(conn, meta):
+            return {'version': meta['source_hash'], 'complete': True, 'rows': int(meta.get('rows', 0))}
+    finally:
+        conn.close()
+    rows = int(meta.get('ingest_rows', 0))
+    if rows:
+        return {'version': f"{meta['ingest_hash']}+{rows}", 'complete': False, 'rows': rows}
+    return {'version': None, 'complete': False, 'rows': 0}
+
+
+# ------------------------
+# GENRE MATRIX
+# ------------------------
+# The title x genre relation as one sparse CSR matrix (genre_matrix.py), saved
+# next to the database at ingest, one file per store version. Genre counts, co-occurrence and PCA all slice
+# its rows by the filter instead of each rebuilding it from title_genre.
+def genre_matrix_path(version, db_path=DB_PATH):
+    base = os.path.splitext(db_path)[0]
+    return f"{base}-{version[:16]}-v{STORE_VERSION}-genres.npz"
+
+
+def write_genre_matrix(version, db_path=DB_PATH, previous=None):
+    # After an incremental ingest from `previous`, that version's matrix is
+    # patched with the changed titles (read_changes()) instead of rebuilt
+    path = genre_matrix_path(version, db_path)
+    matrix = None
+    if previous is not None:
+        changes = read_changes(db_path)
+        old = genre_matrix_path(previous, db_path)
+        if changes is not None and (changes['from'], changes['to']) == (previous, version) and os.path.exists(old):
+            matrix, _, _ = genre_matrix.GenreMatrix.load(old).apply_changes(changes)
+    if matrix is None:
+        matrix = genre_matrix.GenreMatrix.from_pairs(*read_bridge('genre', db_path))
+    matrix.save(path)
+    _remove_older(None, db_path, '.feather')  # titles snapshots of stores before v11
+    return _remove_older(path, db_path, '-genres.npz')
+
+
+def _remove_older(path, db_path, suffix):
+    # Files of older versions are no longer referenced (all of them with path=None)
+    for old in glob.glob(f"{os.path.splitext(db_path)[0]}-*{suffix}"):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass  # still open elsewhere (Windows), removed on a later rebuild
+    return path
+
+
+def read_genre_matrix(version=None, db_path=DB_PATH):
+    # Falls back to title_genre while a first build is still in progress
+    # ("digest+rows" versions have no file) or when the file is missing
+    if version is None:
+        version = store_state(db_path)['version']
+    if version is not None and '+' not in version:
+        path = genre_matrix_path(version, db_path)
+        if os.path.exists(path):
+            return genre_matrix.GenreMatrix.load(path)
+    return genre_matrix.GenreMatrix.from_pairs(*read_bridge('genre', db_path))
+
+
+# ------------------------
+# READ / QUERY
+# ------------------------
+def filter_clause(years, types):
+    # Sidebar filters -> parameterized WHERE clause (uses the release_year/type indexes)
+    types = list(types)
+    if not types:
+        return "WHERE 0", []
+    placeholders = ", ".join("?" * len(types))
+    where = f"WHERE release_year BETWEEN ? AND ? AND type IN ({placeholders})"
+    return where, [int(years[0]), int(years[1])] + types
+
+
+def iter_titles(years, types, chunk_rows=50000, db_path=DB_PATH):
+    # Every column (wide text included) of the filtered titles, chunk_rows at a time
+    where, params = filter_clause(years, types)
+    conn = connect(db_path)
+    try:
+        chunks = pd.read_sql(f"SELECT * FROM titles {where} ORDER BY title_id", conn,
+                             params=params, chunksize=chunk_rows)
+        for chunk in chunks:
+            chunk['date_added'] = from_unix_seconds(chunk['date_added'])
+            yield chunk.drop(columns='title_id')
+    finally:
+        conn.close()
+
+
+def catalog_info(db_path=DB_PATH):
+    # Small summary used for the slider bounds and the fixed rating colors,
+    # so neither needs the full frame in memory
+    conn = connect(db_path)
+    try:
+        year_min, year_max = conn.execute("SELECT MIN(release_year), MAX(release_year) FROM titles").fetchone()
+        ratings = [r for (r,) in conn.execute("SELECT DISTINCT rating FROM titles ORDER BY rating")]
+    finally:
+        conn.close()
+    return {'year_min': int(year_min), 'year_max': int(year_max), 'ratings': ratings}
+
+
+def director_durations(kind, years, types, n=15, db_path=DB_PATH):
+    # Average duration per director for one content type ("Movie" -> minutes,
+    # "TV Show" -> seasons). Returns (top n directors, average over all director credits)
+    column = DURATION_COLUMNS[kind]
+    where, params = filter_clause(years, types)
+    where += f" AND type = ? AND {column} IS NOT NULL"
+    params = params + [kind]
+    joins = """
+        FROM title_director b
+        JOIN titles USING (title_id)
+        JOIN dim_director v ON v.id = b.director_id
+    """
+    conn = connect(db_path)
+    try:
+        top = conn.execute(f"""
+            SELECT v.name, AVG({column}) AS avg_duration {joins} {where}
+            GROUP BY b.director_id
+            ORDER BY avg_duration DESC, v.name
+            LIMIT ?
+        """, params + [n]).fetchall()
+        (overall,) = conn.execute(f"SELECT AVG({column}) {joins} {where}", params).fetchone()
+    finally:
+        conn.close()
+    top = pd.Series([d for _, d in top], index=[name for name, _ in top], name='duration_num', dtype='float64')
+    return top, overall
+
+
+def _name_order(conn, dim):
+    # (names sorted, stored id -> position in that order). Stored ids are in
+    # first-seen order; readers work in name order so results don't depend on
+    # the order titles were ingested in.
+    vocab = pd.read_sql(f"SELECT id, name FROM dim_{dim} ORDER BY name", conn)
+    rank = np.empty(len(vocab), dtype=np.int64)
+    rank[vocab['id'].values] = np.arange(len(vocab))
+    return vocab['name'].tolist(), rank
+
+
+def read_bridge(dim, db_path=DB_PATH):
+    # (title_id, <dim>_id) pairs plus the release_year/type of each title, and
+    # the names of the dimension; <dim>_id is renumbered to index those names
+    conn = connect(db_path)
+    try:
+        pairs = pd.read_sql(f"""
+            SELECT b.title_id, b.{dim}_id, t.release_year, t.type
+            FROM title_{dim} b JOIN titles t USING (title_id)
+            ORDER BY b.title_id
+        """, conn)
+        names, rank = _name_order(conn, dim)
+    finally:
+        conn.close()
+    pairs[f'{dim}_id'] = rank[pairs[f'{dim}_id'].values.astype(np.int64)]
+    return pairs, names
+
+
+def read_changes(db_path=DB_PATH, dim='genre'):
+    # What the last incremental ingest changed, None after a full build:
+    # {'from' / 'to': store versions before and after,
+    #  'removed': title_ids whose previous rows are gone (changed or removed titles),
+    #  'pairs', 'names': read_bridge(dim) for just the added or changed titles}
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN")  # one consistent view of meta and tables
+        meta = read_meta(conn)
+        if 'changes_from' not in meta:
+            conn.execute("COMMIT")
+            return None
+        removed = [t for (t,) in conn.execute("SELECT title_id FROM title_changes WHERE removed ORDER BY title_id")]
+        pairs = pd.read_sql(f"""
+            SELECT b.title_id, b.{dim}_id, t.release_year, t.type
+            FROM title_changes c JOIN title_{dim} b USING (title_id) JOIN titles t USING (title_id)
+            WHERE c.added
+            ORDER BY b.title_id
+        """, conn)
+        names, rank = _name_order(conn, dim)
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    # same dtypes as read_bridge() even when nothing was added
+    pairs = pairs.astype({'title_id': np.int64, f'{dim}_id': np.int64, 'release_year': np.int64})
+    pairs[f'{dim}_id'] = rank[pairs[f'{dim}_id'].values]
+    return {'from': meta['changes_from'], 'to': meta['source_hash'],
+            'removed': np.array(removed, dtype=np.int64), 'pairs': pairs, 'names': names}
+
+
+def read_layout(db_path=DB_PATH):
+    # {genre: np.array([x, y])} computed at ingest, in the layout's node order
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT g.name, l.x, l.y FROM genre_layout l JOIN dim_genre g ON g.id = l.genre_id ORDER BY l.node"
+        ).fetchall()
+    finally:
+        conn.close()
+    return {name: np.array([x, y]) for name, x, y in rows}
+
+
+def read_cube(db_path=DB_PATH):
+    # {'titles': release_year/type/rating/added_month/n,
+    #  'country' | 'director': release_year/type/name/n}
+    # name is categorical over the sorted dim_<dim> names, so its codes follow
+    # name order (what multivalue.top_n counts over)
+    conn = connect(db_path)
+    try:
+        cubes = {'titles': pd.read_sql("SELECT * FROM cube_titles", conn)}
+        for dim in cube.VALUE_CUBE_DIMENSIONS:
+            values = pd.read_sql(f"SELECT release_year, type, {dim}_id, n FROM cube_{dim}", conn)
+            names, rank = _name_order(conn, dim)
+            values.insert(2, 'name', pd.Categorical.from_codes(rank[values.pop(f'{dim}_id').values], names))
+            cubes[dim] = values
+    finally:
+        conn.close()
+    return cubes
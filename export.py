@@ -0,0 +1,75 @@
+# export.py
+# "Download Filtered Data" payloads. Rows are streamed from the store in chunks
+# and encoded chunk by chunk, so neither the full filtered frame (with its long
+# cast/description text) nor one giant CSV string is ever held at once.
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import data_store
+import profiling
+
+# label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+CHUNK_ROWS = 50000
+
+
+def _write_csv(chunks, f):
+    header = True
+    for chunk in chunks:
+        f.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+
+
+def _arrow_schema(columns):
+    # Fixed schema from data_store.TITLES_SCHEMA, not guessed from the data: a
+    # column that is all-missing in a chunk (the duration column of the other
+    # content type, say) keeps its declared type
+    fields = []
+    for col in columns:
+        dtype = data_store.TITLES_SCHEMA.get(col, data_store.ARROW_STRING)
+        if dtype == 'category':
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif dtype == 'datetime64[ns]':
+            fields.append(pa.field(col, pa.timestamp('ns')))
+        elif dtype is data_store.ARROW_STRING:
+            fields.append(pa.field(col, pa.string()))
+        else:
+            fields.append(pa.field(col, pa.from_numpy_dtype(dtype)))
+    return pa.schema(fields)
+
+
+def _write_parquet(chunks, f):
+    writer = None
+    for chunk in chunks:
+        chunk = data_store.apply_dtypes(chunk)
+        if writer is None:
+            writer = pq.ParquetWriter(f, _arrow_schema(chunk.columns), compression='snappy')
+        # one row group per chunk
+        writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+    if writer is not None:
+        writer.close()
+
+
+@profiling.timed(name="encode export")
+def export_bytes(years, types, fmt="CSV", chunk_rows=CHUNK_ROWS, db_path=data_store.DB_PATH):
+    # All columns of the filtered titles, encoded in the given EXPORT_FORMATS format
+    chunks = data_store.iter_titles(years, types, chunk_rows, db_path)
+    buf = io.BytesIO()
+    if fmt == "CSV":
+        _write_csv(chunks, buf)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gz:
+            _write_csv(chunks, gz)
+    elif fmt == "Parquet":
+        _write_parquet(chunks, buf)
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {list(EXPORT_FORMATS)}")
+    return buf.getvalue()
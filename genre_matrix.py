@@ -0,0 +1,115 @@
+# genre_matrix.py
+# The title x genre relation as one sparse CSR 0/1 matrix with its genre
+# vocabulary, built at ingest and shared by every genre computation. With mask
+# the sidebar filter over its rows:
+#   titles per genre = column sums of X[mask]
+#   co-occurrence    = X[mask]^T X[mask]          (cooccurrence.py)
+#   PCA              = PCA / truncated SVD of X[mask]  (genre_pca.py)
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+import memo
+
+
+def filter_mask(filters, years, types):
+    # Rows passing a memo.Filters state, given each row's release year and type
+    return (years >= filters.year_min) & (years <= filters.year_max) & np.isin(types, list(filters.types))
+
+
+class GenreMatrix:
+    # One row per title that lists at least one genre, in title_id order, and
+    # one column per genre, in name order. release_year, type and title_id of
+    # every row ride along for the filter mask. Not modified in place: changes
+    # give a new matrix.
+    def __init__(self, X, genres, years, types, title_ids=None):
+        self.X = sp.csr_matrix(X)
+        self.genres = list(genres)
+        self.years = np.asarray(years)
+        self.types = np.asarray(types, dtype=object)
+        self.title_ids = np.arange(self.X.shape[0]) if title_ids is None else np.asarray(title_ids)
+
+    @classmethod
+    def from_pairs(cls, pairs, genres):
+        # pairs: title_id / genre_id (position in genres) / release_year / type
+        # rows sorted by title_id, as data_store.read_bridge('genre') returns them
+        titles = pairs.drop_duplicates('title_id')
+        rows = np.searchsorted(titles['title_id'].values, pairs['title_id'].values)
+        X = sp.csr_matrix(
+            (np.ones(len(pairs), dtype=np.int32), (rows, pairs['genre_id'].values)),
+            shape=(len(titles), len(genres))
+        )
+        return cls(X, genres, titles['release_year'].values, titles['type'].values, titles['title_id'].values)
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    # ------------------------
+    # FILTERING / COUNTS
+    # ------------------------
+    def select(self, years, types):
+        # Row mask of the titles passing the sidebar filters
+        return filter_mask(memo.Filters.make(years, types), self.years, self.types)
+
+    def rows(self, mask):
+        return GenreMatrix(self.X[mask], self.genres, self.years[mask], self.types[mask], self.title_ids[mask])
+
+    def genre_counts(self, mask=None):
+        # Titles per genre (column sums), aligned with self.genres
+        X = self.X if mask is None else self.X[mask]
+        return np.asarray(X.sum(axis=0)).ravel().astype(np.int64)
+
+    # ------------------------
+    # CHANGES
+    # ------------------------
+    def genre_map(self, genres):
+        # 0/1 matrix taking this matrix's genre columns to their place in
+        # `genres` (which must contain all of them): X @ P is X over `genres`
+        ids = {g: i for i, g in enumerate(genres)}
+        return sp.csr_matrix(
+            (np.ones(len(self.genres), dtype=np.int32), (np.arange(len(self.genres)), [ids[g] for g in self.genres])),
+            shape=(len(self.genres), len(genres))
+        )
+
+    def reindex(self, genres):
+        return GenreMatrix((self.X @ self.genre_map(genres)).tocsr(), genres, self.years, self.types, self.title_ids)
+
+    def concat(self, other):
+        # Rows of both (same genres), back in title_id order
+        title_ids = np.concatenate([self.title_ids, other.title_ids])
+        order = np.argsort(title_ids, kind='stable')
+        return GenreMatrix(
+            sp.vstack([self.X, other.X], format='csr')[order], self.genres,
+            np.concatenate([self.years, other.years])[order],
+            np.concatenate([self.types, other.types])[order],
+            title_ids[order]
+        )
+
+    def apply_changes(self, changes):
+        # -> (next matrix, rows dropped, rows added), all over changes['names'],
+        # for an incremental ingest described by data_store.read_changes():
+        # removed and changed titles are dropped, changed and new ones added
+        current = self.reindex(changes['names'])
+        gone = np.isin(current.title_ids, changes['removed'])
+        added = GenreMatrix.from_pairs(changes['pairs'], changes['names'])
+        return current.rows(~gone).concat(added), current.rows(gone), added
+
+    # ------------------------
+    # FILE
+    # ------------------------
+    def save(self, path):
+        # Plain arrays in an .npz (no pickles), written to a temp file and renamed
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, data=self.X.data, indices=self.X.indices, indptr=self.X.indptr,
+                     shape=np.array(self.X.shape), genres=np.array(self.genres, dtype=str),
+                     years=self.years, types=np.array(self.types, dtype=str), title_ids=self.title_ids)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            X = sp.csr_matrix((f['data'], f['indices'], f['indptr']), shape=tuple(f['shape']))
+            return cls(X, f['genres'].tolist(), f['years'], f['types'].tolist(), f['title_ids'])
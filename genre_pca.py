@@ -0,0 +1,72 @@
+# genre_pca.py
+# 2D PCA projection of the sparse title x genre matrix for the PCA tab.
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, svds
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.utils.extmath import svd_flip
+
+# "pca": exact PCA on the densified rows (fine for the bundled CSV)
+# "incremental": IncrementalPCA fed sparse batches, only one batch is dense at a time
+# "sparse_svd": truncated SVD of the implicitly centered sparse matrix, never densified
+SOLVERS = ("pca", "incremental", "sparse_svd")
+
+# Fitting uses at most this many (randomly sampled) titles, so PCA latency stays
+# capped however wide the year range is; every title is still projected
+MAX_FIT_ROWS = 20000
+BATCH_SIZE = 5000
+
+
+def _centered_operator(X, mean):
+    # (X - mean) as a linear operator, so centering never densifies X; scipy
+    # calls it with 1-D vectors as well as (n, 1) columns
+    return LinearOperator(
+        shape=X.shape,
+        matvec=lambda v: X @ v - mean @ v,
+        rmatvec=lambda u: X.T @ u - np.multiply.outer(mean, u.sum(axis=0)),
+        dtype=np.float64
+    )
+
+
+def fit_components(X, solver="pca", n_components=2):
+    # Returns (mean, components) with components shaped (n_components, n_genres)
+    if solver == "pca" or (solver == "sparse_svd" and min(X.shape) <= n_components + 1):
+        # svds needs k < min(X.shape); such tiny selections are cheap to do exactly
+        pca = PCA(n_components=n_components).fit(X.toarray())
+        return pca.mean_, pca.components_
+    if solver == "incremental":
+        ipca = IncrementalPCA(n_components=n_components, batch_size=BATCH_SIZE).fit(X)
+        return ipca.mean_, ipca.components_
+    if solver == "sparse_svd":
+        mean = np.asarray(X.mean(axis=0)).ravel()
+        # Seeded start vector -> deterministic result for the cache (a constant
+        # one can be in the centered operator's null space)
+        v0 = np.random.default_rng(0).uniform(-1, 1, min(X.shape))
+        u, s, vt = svds(_centered_operator(X, mean), k=n_components, v0=v0)
+        order = np.argsort(-s)
+        # Same sign convention as PCA so the picture doesn't flip between solvers
+        u, vt = svd_flip(u[:, order], vt[order])
+        return mean, vt
+    raise ValueError(f"Unknown PCA solver {solver!r}, expected one of {SOLVERS}")
+
+
+def project(X, solver="pca", max_fit_rows=MAX_FIT_ROWS, seed=0):
+    # X: titles x genres sparse 0/1 matrix -> (titles x 2) coordinates
+    X = X.astype(np.float64)
+    if X.shape[0] < 2 or X.shape[1] < 3:
+        # Not enough titles/genres for two components (e.g. no content type selected)
+        return np.zeros((X.shape[0], 2))
+
+    fit_X = X
+    if X.shape[0] > max_fit_rows:
+        rows = np.random.default_rng(seed).choice(X.shape[0], max_fit_rows, replace=False)
+        fit_X = X[np.sort(rows)]
+
+    mean, components = fit_components(fit_X, solver)
+    return np.asarray(X @ components.T) - mean @ components.T
+
+
+def collapse_points(pca_df, decimals=6):
+    # Titles with the same genre combination land on exactly the same PCA
+    # coordinates -> one weighted point per (PCA1, PCA2, type) with its count
+    keys = pca_df[['PCA1', 'PCA2']].round(decimals).assign(type=pca_df['type'])
+    return keys.groupby(['PCA1', 'PCA2', 'type'], sort=False).size().reset_index(name='count')
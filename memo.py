@@ -0,0 +1,152 @@
+# memo.py
+# Process-wide memoization for derived aggregates and built figures, keyed on
+# the normalized filter state. It lives at module level, so every Streamlit
+# session in the server process shares it: a popular filter combination is
+# computed once and served to everybody.
+import functools
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+MAX_ENTRIES = 512
+MAX_BYTES = 256 * 1024 * 1024
+
+
+class Filters(NamedTuple):
+    # Normalized sidebar state: (2000, 2020) + ["TV Show", "Movie"] and
+    # [2000, 2020] + ["Movie", "TV Show", "Movie"] are the same Filters
+    year_min: int
+    year_max: int
+    types: tuple
+
+    @classmethod
+    def make(cls, years, types):
+        return cls(int(years[0]), int(years[1]), tuple(sorted(set(types))))
+
+    @property
+    def years(self):
+        return (self.year_min, self.year_max)
+
+
+def sizeof(obj):
+    # Approximate memory held by a cached value (only used for eviction)
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if sp.issparse(obj):
+        obj = obj.tocsr()
+        return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    if isinstance(obj, (tuple, list)):
+        return sum(sizeof(o) for o in obj) + sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sum(sizeof(k) + sizeof(v) for k, v in obj.items()) + sys.getsizeof(obj)
+    if isinstance(obj, (int, float, bool)) or obj is None:
+        return sys.getsizeof(obj)
+    # figures, graphs, ...
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class LRUCache:
+    # Least recently used entries are evicted once there are more than
+    # max_entries of them or they hold more than max_bytes
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # one lock per key being computed, so concurrent sessions asking for
+        # the same thing wait for one computation instead of each running it
+        self._computing = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            key_lock = self._computing.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # computed by another session while we were waiting
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+            try:
+                value = compute()
+                self._put(key, value, sizeof(value))
+            finally:
+                with self._lock:
+                    self._computing.pop(key, None)
+        return value
+
+    def _put(self, key, value, size):
+        with self._lock:
+            if size > self.max_bytes:
+                return  # would evict everything else, just don't keep it
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+# The shared cache
+CACHE = LRUCache()
+
+
+def _key(arg):
+    # Objects with a memo_key (e.g. an analytics engine: its store version) are
+    # keyed on that, so the cache never keeps them alive
+    return getattr(arg, 'memo_key', arg)
+
+
+def memoize(fn=None, *, cache=None):
+    # Cache fn's results in the shared LRU cache. Arguments must be hashable:
+    # pass a Filters for the sidebar state, plus the store version so a rebuilt
+    # store never serves stale results. Cached values are shared between
+    # sessions, treat them as read-only.
+    if fn is None:
+        return functools.partial(memoize, cache=cache)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__module__, fn.__qualname__, tuple(_key(a) for a in args),
+               tuple(sorted((k, _key(v)) for k, v in kwargs.items())))
+        return (cache or CACHE).get_or_compute(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,77 @@
+# multivalue.py
+# Comma-separated multi-value columns (country, director, listed_in, cast) as
+# flat integer tokens. A column is split once, in Arrow, into one token array
+# with per-row offsets and dictionary codes; counting is then a bincount over
+# the codes instead of string stacking and value_counts().
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class Tokens(NamedTuple):
+    # Token k belongs to row rows[k] and is vocab[codes[k]]; row i's tokens are
+    # codes[offsets[i]:offsets[i + 1]]. vocab is sorted, so code order is name order.
+    rows: np.ndarray     # int64, non-decreasing
+    codes: np.ndarray    # int32
+    offsets: np.ndarray  # int64, len(rows of the column) + 1
+    vocab: np.ndarray    # str
+
+
+def tokenize(values, sep=','):
+    # "United States, India," -> tokens "India", "United States" for that row.
+    # Values are stripped, empty ones dropped, repeats within a row kept once.
+    n = len(values)
+    arr = pa.array(values, type=pa.string(), from_pandas=True).fill_null('')
+    lists = pc.split_pattern(arr, pattern=sep)
+    flat = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+    rows = np.repeat(np.arange(n, dtype=np.int64), pc.list_value_length(lists).to_numpy(zero_copy_only=False))
+
+    keep = pc.not_equal(flat, '').to_numpy(zero_copy_only=False)
+    flat, rows = flat.filter(pa.array(keep)), rows[keep]
+
+    encoded = pc.dictionary_encode(flat)
+    vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+    codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+    # renumber so codes follow alphabetical order
+    order = np.argsort(vocab, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    codes, vocab = rank[codes], vocab[order]
+
+    # one (row, code) pair per distinct value in a row, sorted by row then name
+    pairs = np.unique(rows * max(len(vocab), 1) + codes)
+    rows, codes = pairs // max(len(vocab), 1), (pairs % max(len(vocab), 1)).astype(np.int32)
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))]).astype(np.int64)
+    return Tokens(rows, codes, offsets, vocab)
+
+
+def top_n(codes, vocab, n=10, weights=None):
+    # One pass over integer codes: (n most common values as a Series, stats).
+    # Ties go to the alphabetically first name, like the sorted value_counts()
+    # they replace. stats: mean / total over the values that occur, and how many do.
+    top, stats = top_counts(np.bincount(codes, weights=weights, minlength=len(vocab)), vocab, n)
+    if weights is None or np.issubdtype(np.asarray(weights).dtype, np.integer):
+        top = top.astype(np.int64)
+    return top, stats
+
+
+def top_counts(counts, vocab, n=10):
+    # top_n() over counts already aligned with vocab (e.g. genre_matrix column sums)
+    present = np.flatnonzero(counts)
+    if len(present) > n:
+        # only sort the candidates: everything tied with the n-th largest count or above
+        cutoff = np.partition(counts[present], len(present) - n)[len(present) - n]
+        present = present[counts[present] >= cutoff]
+    top = present[np.lexsort((present, -counts[present]))][:n]
+
+    occurring = counts[counts > 0]
+    stats = {
+        'mean': float(occurring.mean()) if len(occurring) else float('nan'),
+        'total': float(occurring.sum()),
+        'distinct': int(len(occurring)),
+    }
+    vocab = np.asarray(vocab, dtype=object)
+    return pd.Series(counts[top], index=pd.Index(vocab[top], dtype=object), name='count'), stats
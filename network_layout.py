@@ -0,0 +1,72 @@
+# network_layout.py
+# Node positions for the genre co-occurrence network. The layout is computed once
+# per store version over the full catalog graph (see data_store._write_layout), so
+# every filtered subgraph reuses the same coordinates: nodes never jump around
+# when the filters change, and no layout runs per request.
+import networkx as nx
+import numpy as np
+
+LAYOUTS = ('circular', 'spring', 'kamada_kawai')
+LAYOUT = 'circular'
+SEED = 42
+SCALE = 1.2  # stretch for clarity
+
+# Hand-picked swaps that untangle the circular layout. They were picked with the
+# nodes placed in the order the original dashboard's graph first met them, which
+# the ingest records (data_store._Ingest._add_genre_order) and passes as node_order
+SWAP_PAIRS = [
+    ('Drama', 'Anime Series'),
+    ('Independent Movies', 'LGBTQ Movies'),
+    ('Anime Series', 'International Movies'),
+]
+
+
+def cooccurrence_graph(C, genres):
+    # C: upper triangular genre x genre co-occurrence counts
+    C = C.tocoo()
+    G = nx.Graph()
+    for i, j, w in zip(C.row, C.col, C.data):
+        G.add_edge(genres[i], genres[j], weight=int(w))
+    return G
+
+
+def compute_layout(C, genres, method=LAYOUT, seed=SEED, node_order=()):
+    # -> {genre: np.array([x, y])} for every genre. node_order: the order nodes go
+    # around the circular layout (nodes not in it follow, in graph order)
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown layout {method!r}, expected one of {LAYOUTS}")
+    G = cooccurrence_graph(C, genres)
+    if len(G) == 0:
+        return place_new_nodes({}, genres)
+
+    if method == 'circular':
+        first = [g for g in node_order if g in G]
+        placed = set(first)
+        pos = nx.circular_layout(first + [g for g in G if g not in placed], scale=SCALE)
+        for n1, n2 in SWAP_PAIRS:
+            if n1 in pos and n2 in pos:
+                pos[n1], pos[n2] = pos[n2], pos[n1]
+    elif method == 'spring':
+        # pairs that co-occur often are pulled together
+        pos = nx.spring_layout(G, weight='weight', seed=seed, scale=SCALE)
+    else:
+        # Kamada-Kawai wants distances: frequent pairs -> short edges
+        for _, _, d in G.edges(data=True):
+            d['distance'] = 1.0 / d['weight']
+        pos = nx.kamada_kawai_layout(G, weight='distance', scale=SCALE)
+    pos = {g: np.asarray(p, dtype=float) for g, p in pos.items()}
+    # genres that never co-occur with another one aren't in G
+    return place_new_nodes(pos, genres)
+
+
+def place_new_nodes(pos, genres):
+    # Genres without a position (isolated, or added after the layout was
+    # computed) go on a ring just outside it, so existing nodes keep theirs
+    pos = dict(pos)
+    new = [g for g in genres if g not in pos]
+    radius = max((np.hypot(*p) for p in pos.values()), default=SCALE) * 1.1
+    start = len(pos)
+    for k, g in enumerate(new):
+        angle = (start + k) * np.pi * (3 - np.sqrt(5))  # golden angle, no overlaps
+        pos[g] = radius * np.array([np.cos(angle), np.sin(angle)])
+    return pos
@@ -0,0 +1,202 @@
+# profiling.py
+# Opt-in per-rerun profiling: wall time and memory (tracemalloc) per data stage
+# and chart. Off unless NETFLIX_PROFILE=1 is set or the page is opened with
+# ?profile=1; when off, stage() and timed() cost one thread-local lookup.
+#
+# Every finished stage is also logged as one JSON line on the "netflix.profile"
+# logger (to NETFLIX_PROFILE_LOG if set, else stderr) so production runs can be
+# collected and compared.
+import contextlib
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger("netflix.profile")
+
+_local = threading.local()
+_run_ids = itertools.count(1)
+
+# tracemalloc slows every allocation down, so it only runs while at least one
+# profiled script run is in progress
+_tracing_lock = threading.Lock()
+_tracing_runs = 0
+
+
+def enabled_by_env():
+    return os.environ.get("NETFLIX_PROFILE", "") not in ("", "0")
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    path = os.environ.get("NETFLIX_PROFILE_LOG")
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Profiler:
+    # Stages of one script run. tracemalloc is process-wide, so with several
+    # sessions rerunning at once (or stages running on pool threads, see bind())
+    # the memory numbers include each other's work.
+    def __init__(self, run_id=None):
+        self.run_id = run_id if run_id is not None else next(_run_ids)
+        self.records = []  # finished stages, in start order
+        self._lock = threading.Lock()  # records are appended from several threads
+        self._threads = threading.local()  # open stages of each thread
+        self._started = time.perf_counter()
+        self.active = True
+
+    def _thread(self):
+        # this thread's open stages, and the depth its outermost one starts at
+        state = self._threads
+        if not hasattr(state, 'stack'):
+            state.stack, state.base_depth = [], 0
+        return state
+
+    @property
+    def _stack(self):
+        return self._thread().stack
+
+    def depth(self):
+        # nesting depth a stage started now on this thread gets
+        state = self._thread()
+        return len(state.stack) + state.base_depth
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        record = {'stage': name, 'depth': self.depth(), 'start_bytes': current, 'peak': current}
+        with self._lock:
+            self.records.append(record)
+        self._stack.append(record)
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = (time.perf_counter() - t0) * 1000
+            current, peak = tracemalloc.get_traced_memory()
+            record['peak'] = max(record['peak'], peak)
+            self._stack.pop()
+            if self._stack:
+                # the parent saw everything this stage allocated
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], record['peak'])
+            tracemalloc.reset_peak()
+            record['alloc_mb'] = (current - record['start_bytes']) / 1e6
+            record['peak_mb'] = (record['peak'] - record['start_bytes']) / 1e6
+            logger.info(json.dumps({
+                'run': self.run_id, 'stage': name, 'depth': record['depth'],
+                'ms': round(record['ms'], 3), 'alloc_mb': round(record['alloc_mb'], 3),
+                'peak_mb': round(record['peak_mb'], 3),
+            }))
+
+    def summary(self):
+        # rows for the debug panel
+        with self._lock:
+            records = list(self.records)
+        return [
+            {'stage': '  ' * r['depth'] + r['stage'], 'ms': round(r.get('ms', 0.0), 1),
+             'peak MB': round(r.get('peak_mb', 0.0), 2), 'alloc MB': round(r.get('alloc_mb', 0.0), 2)}
+            for r in records
+        ]
+
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+
+def start(run_id=None):
+    # Profile the rest of this thread's script run (until stop())
+    global _tracing_runs
+    stop()
+    _configure_logger()
+    with _tracing_lock:
+        _tracing_runs += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    _local.profiler = Profiler(run_id)
+    return _local.profiler
+
+
+def stop(profiler=None):
+    # End a profiled run (this thread's by default). Streamlit can abort a run
+    # midway (e.g. a widget changed), so the app also stops the previous run's
+    # profiler at the start of the next one; stopping twice is harmless.
+    global _tracing_runs
+    profiler = profiler or current()
+    if profiler is None or not profiler.active:
+        return profiler
+    profiler.active = False
+    if current() is profiler:
+        _local.profiler = None
+    logger.info(json.dumps({'run': profiler.run_id, 'stage': 'total', 'ms': round(profiler.total_ms(), 3)}))
+    with _tracing_lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0:
+            tracemalloc.stop()
+    return profiler
+
+
+def current():
+    return getattr(_local, 'profiler', None)
+
+
+def bind(fn):
+    # fn, set up to run under this thread's profiler on whichever thread calls
+    # it (thread pools): its stages show up in this run, nested under the stage
+    # open here now
+    profiler = current()
+    if profiler is None:
+        return fn
+    depth = profiler.depth()
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        previous = current()
+        _local.profiler = profiler
+        profiler._thread().base_depth = depth
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler._thread().base_depth = 0
+            _local.profiler = previous
+
+    return bound
+
+
+@contextlib.contextmanager
+def stage(name):
+    # Time a block if this run is being profiled, otherwise do nothing
+    profiler = current()
+    if profiler is None:
+        yield None
+        return
+    with profiler.stage(name) as record:
+        yield record
+
+
+def timed(fn=None, *, name=None):
+    # Decorator version of stage(); string arguments (chart dimension, solver,
+    # ...) are part of the stage name so e.g. each top_figure call shows up apart
+    if fn is None:
+        return functools.partial(timed, name=name)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if current() is None:
+            return fn(*args, **kwargs)
+        labels = [repr(a) for a in args if isinstance(a, str) and len(a) < 20]
+        label = f"{name or fn.__name__}({', '.join(labels)})" if labels else (name or fn.__name__)
+        with stage(label):
+            return fn(*args, **kwargs)
+
+    return wrapper
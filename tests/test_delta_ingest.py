@@ -0,0 +1,134 @@
+# test_delta_ingest.py
+# An incremental (delta) ingest must leave the store exactly as a full rebuild
+# from the same CSV would: titles, bridges, count cubes (negated rows of
+# changed / removed titles), the recorded changes and the carried-over genre
+# index and matrix file.
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+import data_store
+import memo
+from cooccurrence import CooccurrenceIndex
+from genre_matrix import GenreMatrix
+
+CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "netflix_titles.csv")
+
+FILTERS = [
+    memo.Filters.make((1925, 2021), ['Movie', 'TV Show']),
+    memo.Filters.make((2000, 2021), ['Movie']),
+    memo.Filters.make((2015, 2016), ['TV Show']),
+]
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    # (delta db, full rebuild db, version before, version after, titles whose
+    # rows changed or went away); the delta db engine's genre index is built
+    # (and cached for FILTERS) before the delta
+    monkeypatch.setattr(data_store, 'CHUNK_ROWS', 500)  # several batches
+    df = pd.read_csv(CSV, dtype=str).iloc[:2000]
+    src, delta_db, full_db = tmp_path / "src.csv", str(tmp_path / "delta.db"), str(tmp_path / "full.db")
+    df.to_csv(src, index=False)
+    v1 = data_store.sync_store(str(src), delta_db)
+    before = analytics.engine_for(v1, delta_db)
+    for f in FILTERS:
+        before.genre_cooccurrence(f)
+
+    # change 50 titles, remove 30, add 40 (some with genres new to the store)
+    rng = np.random.default_rng(1)
+    changed = rng.choice(len(df), 50, replace=False)
+    m = df.copy()
+    m.loc[changed[:20], 'listed_in'] = 'Dramas, Brand New Genre'
+    m.loc[changed[20:35], 'rating'] = 'TV-MA'
+    m.loc[changed[35:], 'country'] = 'Atlantis, France'
+    edited = int((m.loc[changed].fillna('') != df.loc[changed].fillna('')).any(axis=1).sum())  # some edits are no-ops
+    removed = rng.choice(np.setdiff1d(np.arange(len(df)), changed), 30, replace=False)
+    m = m.drop(index=removed)
+    new = df.sample(40, random_state=2).copy()
+    new['show_id'] = [f"n{i}" for i in range(40)]
+    new.loc[new.index[:10], 'listed_in'] = 'Zzz Genre, Comedies'
+    m = pd.concat([m, new]).sample(frac=1, random_state=3)  # rows reordered too
+    m.to_csv(src, index=False)
+
+    v2 = data_store.sync_store(str(src), delta_db)
+    assert data_store.sync_store(str(src), full_db, incremental=False) == v2
+    return delta_db, full_db, v1, v2, edited + len(removed)
+
+
+def _query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql(sql, conn)
+    finally:
+        conn.close()
+
+
+def test_titles_and_bridges_match_full_rebuild(stores):
+    delta_db, full_db, _, _, _ = stores
+    # title_ids differ between the stores; show_id identifies a title
+    sql = "SELECT * FROM titles"
+    a, b = (_query(db, sql).drop(columns='title_id').sort_values('show_id').reset_index(drop=True)
+            for db in (delta_db, full_db))
+    pd.testing.assert_frame_equal(a, b)
+    for dim in ['country', 'director', 'genre', 'cast']:
+        sql = f"""
+            SELECT t.show_id, d.name FROM title_{dim} x
+            JOIN titles t USING (title_id) JOIN dim_{dim} d ON d.id = x.{dim}_id
+            ORDER BY 1, 2
+        """
+        pd.testing.assert_frame_equal(_query(delta_db, sql), _query(full_db, sql))
+
+
+def test_cubes_match_full_rebuild(stores):
+    delta_db, full_db, _, _, _ = stores
+    a, b = data_store.read_cube(delta_db), data_store.read_cube(full_db)
+    for name in ['titles', 'country', 'director']:
+        keys = list(b[name].columns[:-1])
+        x, y = (c[name].astype({k: object for k in keys}).sort_values(keys, na_position='first').reset_index(drop=True)
+                for c in (a, b))
+        pd.testing.assert_frame_equal(x, y)
+
+
+def test_changes(stores):
+    delta_db, full_db, v1, v2, gone = stores
+    changes = data_store.read_changes(delta_db)
+    assert (changes['from'], changes['to']) == (v1, v2)
+    assert len(changes['removed']) == gone  # changed titles' old rows too
+    assert 40 <= changes['pairs']['title_id'].nunique() <= gone - 30 + 40
+    assert 'Brand New Genre' in changes['names'] and 'Zzz Genre' in changes['names']
+    assert data_store.read_changes(full_db) is None
+
+
+def test_genre_matrix_file_matches_full_rebuild(stores):
+    delta_db, full_db, _, v2, _ = stores
+    patched = data_store.read_genre_matrix(v2, delta_db)
+    rebuilt = GenreMatrix.from_pairs(*data_store.read_bridge('genre', delta_db))
+    assert (patched.X != rebuilt.X).nnz == 0 and patched.X.shape == rebuilt.X.shape
+    assert patched.genres == rebuilt.genres == data_store.read_genre_matrix(v2, full_db).genres
+    assert (patched.title_ids == rebuilt.title_ids).all()
+    assert (patched.years == rebuilt.years).all() and list(patched.types) == list(rebuilt.types)
+
+
+def test_carried_index_matches_index_from_store(stores):
+    delta_db, _, v1, v2, _ = stores
+    before = analytics.engine_for(v1, delta_db)
+    old_shape = before.index.X.shape
+    after = analytics.engine_for(v2, delta_db)
+    assert after._previous is before
+    index = after.index
+    reference = CooccurrenceIndex.from_store(delta_db, v2)
+    assert index is not before.index and before.index.X.shape == old_shape
+    assert index.genres == reference.genres
+    assert (index.X != reference.X).nnz == 0 and index.X.shape == reference.X.shape
+    assert (index.title_ids == reference.title_ids).all() and (index.years == reference.years).all()
+    assert list(index.types) == list(reference.types)
+    assert list(index.positions) == list(reference.positions)  # node (color) order
+    for g in reference.genres:
+        np.testing.assert_allclose(index.positions[g], reference.positions[g])
+    for f in FILTERS:
+        assert sorted(index.edges(f.years, f.types)) == sorted(reference.edges(f.years, f.types))
@@ -0,0 +1,39 @@
+# test_genre_pca.py
+# Every solver must cope with selections that have fewer titles than genres
+# (a narrow year range / one type), down to the 2 titles project() accepts.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import genre_pca
+
+N_GENRES = 42  # as in the bundled CSV
+
+
+def _titles(n, seed=0):
+    # n titles with 1-3 genres each, as a sparse 0/1 matrix
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(np.arange(n), 3)
+    cols = rng.integers(0, N_GENRES, len(rows))
+    X = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, N_GENRES))
+    X.data[:] = 1
+    return X
+
+
+@pytest.mark.parametrize("solver", genre_pca.SOLVERS)
+@pytest.mark.parametrize("n", [2, 3, 4, 20, N_GENRES - 1])
+def test_fewer_titles_than_genres(solver, n):
+    coords = genre_pca.project(_titles(n), solver)
+    assert coords.shape == (n, 2)
+    assert np.isfinite(coords).all()
+
+
+@pytest.mark.parametrize("solver", genre_pca.SOLVERS)
+def test_solvers_agree(solver):
+    # same picture from every solver, up to the sign of each axis
+    X = _titles(20)
+    expected = genre_pca.project(X, "pca")
+    coords = genre_pca.project(X, solver)
+    for axis in range(2):
+        a, b = coords[:, axis], expected[:, axis]
+        assert np.allclose(a, b, atol=1e-6) or np.allclose(a, -b, atol=1e-6)